@@ -1,5 +1,11 @@
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from collections import OrderedDict
+import asyncio
+import hashlib
+import threading
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
@@ -18,6 +24,193 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash (standalone function)"""
     return pwd_context.verify(plain_password, hashed_password)
 
+class PasswordHasher:
+    """Runs bcrypt hashing and verification on a bounded worker pool.
+
+    bcrypt is deliberately slow (~200 ms per call), so running it inside an
+    ``async def`` handler stalls the event loop for every other request.
+    Calls are dispatched to a thread or process pool instead, and new work is
+    rejected with a 503 once ``max_queue`` calls are already pending.
+    """
+    
+    def __init__(self, executor_type: str = "thread", workers: int = 2, max_queue: int = 64):
+        self.executor_type = executor_type if executor_type in ("thread", "process") else "thread"
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        
+        # Metrics
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+    
+    def _get_executor(self) -> Executor:
+        """Create the worker pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                if self.executor_type == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="password-hasher"
+                    )
+            return self._executor
+    
+    async def _run(self, func, *args):
+        """Submit a hashing call to the pool, enforcing the queue limit"""
+        with self._lock:
+            if self.pending >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            self.submitted += 1
+        
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.pending -= 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+        
+        with self._lock:
+            self.completed += 1
+        return result
+    
+    async def hash(self, password: str) -> str:
+        """Generate password hash without blocking the event loop"""
+        return await self._run(hash_password, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain password against its hash without blocking the event loop"""
+        return await self._run(verify_password, plain_password, hashed_password)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool configuration and call metrics"""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "executor": self.executor_type,
+                "workers": self.workers,
+                "maxQueue": self.max_queue,
+                "pending": self.pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avgMs": round(self.total_seconds / finished * 1000, 2) if finished else 0.0,
+                "maxMs": round(self.max_seconds * 1000, 2)
+            }
+    
+    def shutdown(self):
+        """Stop the worker pool"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+# Shared password hashing pool
+password_hasher = PasswordHasher(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+class TokenCache:
+    """Bounded LRU cache of verified JWT payloads.
+
+    Entries are keyed by a SHA-256 digest of the raw token (so tokens are
+    never held in memory as-is) and expire at the token's own ``exp`` claim.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+    
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a token, or None on miss/expiry"""
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+    
+    def put(self, token: str, payload: Dict[str, Any]):
+        """Cache a verified payload until its exp claim"""
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+            return
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, token: str) -> bool:
+        """Drop a token from the cache (used on logout and refresh)"""
+        with self._lock:
+            removed = self._entries.pop(self._digest(token), None) is not None
+            if removed:
+                self.invalidations += 1
+            return removed
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxEntries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+# Shared cache of verified tokens
+token_cache = TokenCache(max_entries=settings.JWT_CACHE_MAX_ENTRIES)
+
 # JWT token security
 security = HTTPBearer()
 
@@ -55,12 +248,17 @@ class AuthUtils:
     @staticmethod
     def verify_token(token: str) -> Optional[Dict[str, Any]]:
         """Verify and decode JWT token"""
+        payload = token_cache.get(token)
+        if payload is not None:
+            return payload
+        
         try:
             payload = jwt.decode(
                 token, 
                 settings.JWT_SECRET_KEY, 
                 algorithms=[settings.JWT_ALGORITHM]
             )
+            token_cache.put(token, payload)
             return payload
         except JWTError:
             return None
@@ -68,7 +266,7 @@ class AuthUtils:
 # Dependency to get current user from JWT token
 async def get_current_user_from_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Extract current user from JWT token and return full user dict"""
-    from app.data import get_user_by_id
+    from app.repositories import repositories
     
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -88,7 +286,7 @@ async def get_current_user_from_token(credentials: HTTPAuthorizationCredentials
             raise credentials_exception
         
         # Return the full user dict so routes can access user fields
-        user = get_user_by_id(user_id)
+        user = await repositories.users.get_by_id(user_id)
         if user is None:
             raise credentials_exception
             
@@ -112,5 +310,9 @@ async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCrede
     
     return None
 
+def invalidate_token(token: str) -> bool:
+    """Remove a token from the verified-token cache"""
+    return token_cache.invalidate(token)
+
 # Create auth utilities instance
 auth_utils = AuthUtils()
\ No newline at end of file
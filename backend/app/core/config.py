@@ -10,6 +10,18 @@ class Settings:
     YOUTUBE_API_KEY: str = os.getenv("YOUTUBE_API_KEY", "")
     YOUTUBE_API_SERVICE_NAME: str = "youtube"
     YOUTUBE_API_VERSION: str = "v3"
+    YOUTUBE_API_BASE_URL: str = os.getenv("YOUTUBE_API_BASE_URL", "https://www.googleapis.com/youtube/v3")
+    YOUTUBE_HTTP_TIMEOUT_SECONDS: float = float(os.getenv("YOUTUBE_HTTP_TIMEOUT_SECONDS", 8.0))
+    YOUTUBE_MAX_CONNECTIONS: int = int(os.getenv("YOUTUBE_MAX_CONNECTIONS", 20))
+    YOUTUBE_FANOUT_CONCURRENCY: int = int(os.getenv("YOUTUBE_FANOUT_CONCURRENCY", 4))
+    YOUTUBE_BATCH_WINDOW_MS: float = float(os.getenv("YOUTUBE_BATCH_WINDOW_MS", 5))
+    YOUTUBE_CACHE_PATH: str = os.getenv("YOUTUBE_CACHE_PATH", "cache/youtube_cache.sqlite3")
+    YOUTUBE_CACHE_MEMORY_ENTRIES: int = int(os.getenv("YOUTUBE_CACHE_MEMORY_ENTRIES", 2000))
+    YOUTUBE_SEARCH_TTL_SECONDS: float = float(os.getenv("YOUTUBE_SEARCH_TTL_SECONDS", 6 * 3600))
+    YOUTUBE_DETAILS_TTL_SECONDS: float = float(os.getenv("YOUTUBE_DETAILS_TTL_SECONDS", 24 * 3600))
+    YOUTUBE_STALE_SECONDS: float = float(os.getenv("YOUTUBE_STALE_SECONDS", 24 * 3600))
+    YOUTUBE_PREWARM_INTERVAL_SECONDS: float = float(os.getenv("YOUTUBE_PREWARM_INTERVAL_SECONDS", 1800))
+    YOUTUBE_PREWARM_REFRESH_AHEAD_SECONDS: float = float(os.getenv("YOUTUBE_PREWARM_REFRESH_AHEAD_SECONDS", 3600))
     
     # OpenRouter API Configuration
     OPENROUTER_API_KEY: str = os.getenv("OPENROUTER_API_KEY", "")
@@ -20,6 +32,12 @@ class Settings:
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "fallback-secret-key-change-this")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", 1440))
+    JWT_CACHE_MAX_ENTRIES: int = int(os.getenv("JWT_CACHE_MAX_ENTRIES", 10000))
+    
+    # Password Hashing Pool Configuration
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # thread, process
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
     
     # Security Configuration
     SECRET_KEY: str = os.getenv("SECRET_KEY", "fallback-secret-key")
@@ -33,12 +51,52 @@ class Settings:
     MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017/")
     MONGODB_DATABASE: str = os.getenv("MONGODB_DATABASE", "pixel_pirates")
     
+    # MongoDB Connection Pool Configuration
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", 100))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", 5))
+    MONGODB_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", 300000))
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", 5000))
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", 5000))
+    MONGODB_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", 5000))
+    MONGODB_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", 5000))
+    
+    # Repository backends per collection: "mock" (in-process dicts) or "mongo"
+    DATA_BACKEND: str = os.getenv("DATA_BACKEND", "mock")
+    USERS_BACKEND: str = os.getenv("USERS_BACKEND", DATA_BACKEND)
+    TOPICS_BACKEND: str = os.getenv("TOPICS_BACKEND", DATA_BACKEND)
+    LEADERBOARD_BACKEND: str = os.getenv("LEADERBOARD_BACKEND", DATA_BACKEND)
+    SEARCH_HISTORY_BACKEND: str = os.getenv("SEARCH_HISTORY_BACKEND", DATA_BACKEND)
+    VIDEOS_BACKEND: str = os.getenv("VIDEOS_BACKEND", DATA_BACKEND)
+    
+    # Search History Persistence (write-behind batches to MongoDB)
+    SEARCH_HISTORY_FLUSH_SECONDS: float = float(os.getenv("SEARCH_HISTORY_FLUSH_SECONDS", 2.0))
+    SEARCH_HISTORY_BATCH_SIZE: int = int(os.getenv("SEARCH_HISTORY_BATCH_SIZE", 100))
+    SEARCH_HISTORY_MAX_PENDING: int = int(os.getenv("SEARCH_HISTORY_MAX_PENDING", 10000))
+    SEARCH_HISTORY_CACHED_USERS: int = int(os.getenv("SEARCH_HISTORY_CACHED_USERS", 10000))
+    SEARCH_HISTORY_RETENTION_DAYS: int = int(os.getenv("SEARCH_HISTORY_RETENTION_DAYS", 90))
+    
     # Learning Algorithm Configuration
     PASSING_SCORE_THRESHOLD: float = 0.70  # 70% to pass
     ADAPTIVE_DIFFICULTY_ENABLED: bool = True
     MAX_QUIZ_QUESTIONS: int = 15
     MIN_QUIZ_QUESTIONS: int = 5
     
+    # Leaderboard Streaming Configuration
+    LEADERBOARD_STREAM_MAX_SUBSCRIBERS: int = int(os.getenv("LEADERBOARD_STREAM_MAX_SUBSCRIBERS", 500))
+    LEADERBOARD_STREAM_TICK_SECONDS: float = float(os.getenv("LEADERBOARD_STREAM_TICK_SECONDS", 1.0))
+    LEADERBOARD_STREAM_QUEUE_SIZE: int = int(os.getenv("LEADERBOARD_STREAM_QUEUE_SIZE", 16))
+    
+    # Search Index Configuration
+    SEARCH_INDEX_REFRESH_SECONDS: float = float(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", 60))
+    SEARCH_CACHE_MAX_ENTRIES: int = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 1024))
+    SEARCH_CACHE_TTL_SECONDS: float = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", 60))
+    SUGGESTIONS_REFRESH_SECONDS: float = float(os.getenv("SUGGESTIONS_REFRESH_SECONDS", 60))
+    
+    # Trending Searches Configuration
+    TRENDING_CAPACITY: int = int(os.getenv("TRENDING_CAPACITY", 256))
+    TRENDING_SHORT_HALF_LIFE_SECONDS: float = float(os.getenv("TRENDING_SHORT_HALF_LIFE_SECONDS", 3600))
+    TRENDING_LONG_HALF_LIFE_SECONDS: float = float(os.getenv("TRENDING_LONG_HALF_LIFE_SECONDS", 86400))
+    
     # Video Search Configuration
     MAX_VIDEO_RESULTS: int = 10
     VIDEO_DURATION_PREFERENCE: str = "medium"  # short, medium, long
@@ -3,8 +3,11 @@ MongoDB Database Connection and Utilities
 """
 
 import asyncio
-from typing import Optional
+import threading
+import time
+from typing import Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import monitoring
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from app.core.config import Settings
 import logging
@@ -13,47 +16,175 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Collects connection pool metrics from PyMongo CMAP events.
+
+    Events fire on the driver's worker threads, so counters are guarded by a
+    lock. Checkout wait time uses the event's ``duration`` when the driver
+    provides it and falls back to a per-thread start timestamp otherwise.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checked_out = 0
+        self.checked_in = 0
+        self.checkout_started = 0
+        self.checkout_failed = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.pool_clears = 0
+        self.wait_total_seconds = 0.0
+        self.wait_max_seconds = 0.0
+    
+    def _finish_wait(self, event) -> float:
+        duration = getattr(event, "duration", None)
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        if duration is None:
+            duration = time.perf_counter() - started if started is not None else 0.0
+        return duration
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+    
+    def pool_closed(self, event):
+        pass
+    
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+    
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+        with self._lock:
+            self.checkout_started += 1
+    
+    def connection_check_out_failed(self, event):
+        duration = self._finish_wait(event)
+        with self._lock:
+            self.checkout_failed += 1
+            reason = str(event.reason)
+            self.checkout_failures[reason] = self.checkout_failures.get(reason, 0) + 1
+            self.wait_total_seconds += duration
+            self.wait_max_seconds = max(self.wait_max_seconds, duration)
+    
+    def connection_checked_out(self, event):
+        duration = self._finish_wait(event)
+        with self._lock:
+            self.checked_out += 1
+            self.wait_total_seconds += duration
+            self.wait_max_seconds = max(self.wait_max_seconds, duration)
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_in += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return current pool usage and checkout wait statistics"""
+        with self._lock:
+            total = self.connections_created - self.connections_closed
+            in_use = self.checked_out - self.checked_in
+            waits = self.checked_out + self.checkout_failed
+            return {
+                "totalConnections": total,
+                "inUse": in_use,
+                "available": max(0, total - in_use),
+                "waiting": max(0, self.checkout_started - waits),
+                "connectionsCreated": self.connections_created,
+                "connectionsClosed": self.connections_closed,
+                "checkouts": self.checked_out,
+                "checkoutFailures": dict(self.checkout_failures),
+                "poolClears": self.pool_clears,
+                "avgCheckoutWaitMs": round(self.wait_total_seconds / waits * 1000, 3) if waits else 0.0,
+                "maxCheckoutWaitMs": round(self.wait_max_seconds * 1000, 3)
+            }
+
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database: Optional[AsyncIOMotorDatabase] = None
+    pool_metrics: Optional[PoolMetricsListener] = None
+    pool_options: Dict[str, Any] = {}
 
 # Create global database instance
 db = Database()
 
 async def connect_to_mongo(settings: Settings) -> bool:
-    """Create database connection"""
+    """Create database connection.
+
+    The new client is verified before it replaces the current one, so a
+    failed reconnect leaves a working connection in place.
+    """
+    client: Optional[AsyncIOMotorClient] = None
     try:
         logger.info(f"Connecting to MongoDB at: {settings.MONGODB_URL}")
         
+        pool_options = {
+            "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+            "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+            "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+            "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+            "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS
+        }
+        pool_metrics = PoolMetricsListener()
+        
         # Create MongoDB client
-        db.client = AsyncIOMotorClient(
+        client = AsyncIOMotorClient(
             settings.MONGODB_URL,
-            serverSelectionTimeoutMS=5000,  # 5 second timeout
-            connectTimeoutMS=5000,
-            socketTimeoutMS=5000,
-            maxPoolSize=10,
-            minPoolSize=1
+            event_listeners=[pool_metrics],
+            **pool_options
         )
         
         # Verify connection
-        await db.client.admin.command('ping')
+        await client.admin.command('ping')
         logger.info("✅ MongoDB connection successful!")
         
-        # Get database
-        db.database = db.client[settings.MONGODB_DATABASE]
+        # Pre-warm the pool: concurrent pings force minPoolSize connections open
+        # now instead of on the first burst of requests
+        await asyncio.gather(*(
+            client.admin.command('ping') for _ in range(settings.MONGODB_MIN_POOL_SIZE)
+        ))
+        logger.info(f"✅ Pre-warmed {settings.MONGODB_MIN_POOL_SIZE} pooled connections")
+        
+        # Swap in the verified client (e.g. on /api/database/reconnect)
+        previous = db.client
+        db.client = client
+        db.pool_options = pool_options
+        db.pool_metrics = pool_metrics
+        db.database = client[settings.MONGODB_DATABASE]
+        if previous is not None:
+            previous.close()
         logger.info(f"✅ Connected to database: {settings.MONGODB_DATABASE}")
         
         return True
         
     except ConnectionFailure as e:
         logger.error(f"❌ Failed to connect to MongoDB: {e}")
-        return False
     except ServerSelectionTimeoutError as e:
         logger.error(f"❌ MongoDB server selection timeout: {e}")
-        return False
     except Exception as e:
         logger.error(f"❌ Unexpected error connecting to MongoDB: {e}")
-        return False
+    
+    if client is not None:
+        client.close()
+    return False
 
 async def close_mongo_connection():
     """Close database connection"""
@@ -63,7 +194,7 @@ async def close_mongo_connection():
 
 async def get_database() -> AsyncIOMotorDatabase:
     """Get database instance"""
-    if not db.database:
+    if db.database is None:
         raise RuntimeError("Database not initialized. Call connect_to_mongo() first.")
     return db.database
 
@@ -72,6 +203,17 @@ async def get_collection(collection_name: str) -> AsyncIOMotorCollection:
     database = await get_database()
     return database[collection_name]
 
+def get_pool_stats() -> Dict[str, Any]:
+    """Return connection pool configuration and live metrics"""
+    if db.database is None or not db.pool_metrics:
+        return {"connected": False}
+    
+    return {
+        "connected": True,
+        "options": dict(db.pool_options),
+        "metrics": db.pool_metrics.get_stats()
+    }
+
 async def test_connection() -> dict:
     """Test the database connection and return connection status"""
     try:
@@ -112,4 +254,8 @@ class Collections:
     USER_PROGRESS = "user_progress"
     VIDEOS = "videos"
     LEADERBOARD = "leaderboard"
-    ANALYTICS = "analytics"
\ No newline at end of file
+    ANALYTICS = "analytics"
+    SEARCH_HISTORY = "search_history"
+    LEADERBOARD_WINDOWS = "leaderboard_windows"
+    LEADERBOARD_META = "leaderboard_meta"
+    LEADERBOARD_LANGUAGES = "leaderboard_languages"
\ No newline at end of file
@@ -1,7 +1,9 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Deque, Optional, Tuple
+from collections import deque
 from app.models import *
-from app.core.auth import hash_password
+from app.data.ranking import Leaderboard, WindowedLeaderboards
 import json
+import re
 from datetime import datetime, date
 
 # Mock database - In production, this would be replaced with actual database calls
@@ -10,7 +12,7 @@ MOCK_USERS = {
         "id": "user-1",
         "name": "Alex Johnson",
         "email": "alex@edutwin.com",
-        "password": "password123",  # Will be hashed on initialization
+        "password": "$2b$12$4s6Q1Jy2XUuPEAZNKlolN.lyPowT7Q9NViRpjNCMdJcgSMoYt9Oqi",  # bcrypt("password123"), precomputed
         "completedTopics": ["topic-1"],
         "pendingTopics": ["topic-3", "topic-4", "topic-5"],
         "inProgressTopics": ["topic-2"],
@@ -26,6 +28,8 @@ MOCK_USERS = {
                 "timeWatched": "10:15"
             }
         ],
+        "topicScores": {"topic-1": 2},
+        "languageScores": {"python": 2},
         "totalScore": 85,
         "rank": 3,
         "preferredStyle": "visual",
@@ -35,11 +39,13 @@ MOCK_USERS = {
         "id": "user-2",
         "name": "Sarah Johnson",
         "email": "sarah@edutwin.com",
-        "password": "password456",  # Will be hashed on initialization
+        "password": "$2b$12$jBiVqpsS4EQuiJ1kEHGrWeeW5523yINPKkUTkUGIbG9TM8Fyvcg8C",  # bcrypt("password456"), precomputed
         "completedTopics": ["topic-1", "topic-2"],
         "pendingTopics": ["topic-5"],
         "inProgressTopics": ["topic-3", "topic-4"],
         "videosWatched": [],
+        "topicScores": {"topic-1": 2, "topic-2": 1},
+        "languageScores": {"python": 2, "java": 1},
         "totalScore": 95,
         "rank": 1,
         "preferredStyle": "logical",
@@ -49,11 +55,13 @@ MOCK_USERS = {
         "id": "user-3",
         "name": "Michael Chen",
         "email": "michael@edutwin.com",
-        "password": "password789",  # Will be hashed on initialization
+        "password": "$2b$12$AMD0vpJIRIW4qpcPLYqu9u/iYivqmou8EboA8naKHprsgmJu/KW2C",  # bcrypt("password789"), precomputed
         "completedTopics": ["topic-1"],
         "pendingTopics": ["topic-4", "topic-5"],
         "inProgressTopics": ["topic-2", "topic-3"],
         "videosWatched": [],
+        "topicScores": {"topic-1": 1},
+        "languageScores": {"python": 1},
         "totalScore": 92,
         "rank": 2,
         "preferredStyle": "simplified",
@@ -61,18 +69,26 @@ MOCK_USERS = {
     }
 }
 
-# Track if passwords have been hashed
-_passwords_hashed = False
+# Track if mock data has been initialized
+_data_initialized = False
+
+def is_password_hash(password: str) -> bool:
+    """Check whether a stored password is already a bcrypt hash"""
+    return password.startswith(("$2a$", "$2b$", "$2y$"))
 
 def initialize_data():
-    """Initialize mock data with hashed passwords"""
-    global _passwords_hashed
-    if not _passwords_hashed:
-        for user_id, user in MOCK_USERS.items():
-            if not user["password"].startswith("$2b$"):  # Not already hashed
-                user["password"] = hash_password(user["password"])
-        _passwords_hashed = True
-        print("✅ Mock data initialized with hashed passwords")
+    """Initialize mock data indexes.
+
+    Seed users ship with precomputed bcrypt hashes. Any plaintext seed
+    passwords (e.g. bulk load-test users) are hashed lazily on first login
+    rather than here, so startup time doesn't grow with seed size.
+    """
+    global _data_initialized
+    if not _data_initialized:
+        rebuild_email_index()
+        rebuild_language_leaderboards()
+        _data_initialized = True
+        print(f"✅ Mock data initialized ({len(MOCK_USERS)} users, {len(MOCK_TOPICS)} topics)")
 
 MOCK_TOPICS = {
     "topic-1": {
@@ -152,30 +168,63 @@ MOCK_LEADERBOARD = [
     {"rank": 3, "userId": "user-1", "name": "Alex Johnson", "score": 85, "topicsCompleted": 5, "avatar": "https://api.dicebear.com/7.x/avataaars/svg?seed=Alex"},
 ]
 
-MOCK_SEARCH_HISTORY = {
-    "user-1": [
+# Ranked index over leaderboard entries (O(log n) rank, top-N and neighbours)
+LEADERBOARD_INDEX = Leaderboard(MOCK_LEADERBOARD)
+
+# Per-language ranked indexes keyed by language_key(), scored by the sum of
+# each user's best quiz score per topic in that language
+LANGUAGE_LEADERBOARDS: Dict[str, Leaderboard] = {}
+
+# Daily/weekly/monthly score buckets
+WINDOWED_LEADERBOARDS = WindowedLeaderboards()
+
+# Searches kept per user, newest first
+SEARCH_HISTORY_LIMIT = 10
+
+# Fixed-capacity ring per user: appendleft() drops the oldest search for free
+MOCK_SEARCH_HISTORY: Dict[str, Deque[Dict[str, Any]]] = {
+    "user-1": deque([
         {"query": "Python generators", "time": "2 hours ago"},
         {"query": "Binary search tree", "time": "5 hours ago"},
         {"query": "SQL joins explained", "time": "Yesterday"}
-    ]
+    ], maxlen=SEARCH_HISTORY_LIMIT)
 }
 
+# Precomputed recommendations: (language, topic_id) -> ranked videos. A video is
+# indexed under one topic only, like the unique youtube_id index on `videos`
+MOCK_VIDEO_INDEX: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+
 def get_mock_data():
     return {
         "users": MOCK_USERS,
         "topics": MOCK_TOPICS,
         "leaderboard": MOCK_LEADERBOARD,
-        "search_history": MOCK_SEARCH_HISTORY
+        "search_history": MOCK_SEARCH_HISTORY,
+        "videos": MOCK_VIDEO_INDEX
     }
 
 def get_user_by_id(user_id: str):
     return MOCK_USERS.get(user_id)
 
+def normalize_email(email: str) -> str:
+    """Normalize an email address for case-insensitive lookups"""
+    return email.strip().lower()
+
+# Normalized email -> user_id index, mirrors the unique `email` index on the
+# users collection so logins and signups don't scan MOCK_USERS
+MOCK_EMAIL_INDEX: Dict[str, str] = {}
+
+def rebuild_email_index():
+    """Rebuild the email index from MOCK_USERS"""
+    MOCK_EMAIL_INDEX.clear()
+    for user_id, user in MOCK_USERS.items():
+        MOCK_EMAIL_INDEX[normalize_email(user["email"])] = user_id
+
 def get_user_by_email(email: str):
-    for user in MOCK_USERS.values():
-        if user["email"] == email:
-            return user
-    return None
+    user_id = MOCK_EMAIL_INDEX.get(normalize_email(email))
+    if user_id is None:
+        return None
+    return MOCK_USERS.get(user_id)
 
 def get_topic_by_id(topic_id: str):
     return MOCK_TOPICS.get(topic_id)
@@ -184,17 +233,105 @@ def get_all_topics():
     return list(MOCK_TOPICS.values())
 
 def get_leaderboard():
-    return MOCK_LEADERBOARD
+    return LEADERBOARD_INDEX.top(len(LEADERBOARD_INDEX))
+
+def build_leaderboard_entry(user: dict) -> dict:
+    """Build a leaderboard entry from a user record"""
+    return {
+        "userId": user["id"],
+        "name": user["name"],
+        "score": user.get("totalScore", 0),
+        "topicsCompleted": len(user.get("completedTopics", [])),
+        "avatar": f"https://api.dicebear.com/7.x/avataaars/svg?seed={user['name']}"
+    }
+
+def upsert_leaderboard_entry(entry: dict):
+    """Insert or replace a user's leaderboard entry"""
+    LEADERBOARD_INDEX.upsert(entry)
+
+def language_key(language: str) -> str:
+    """Normalize a language name for use as an index/document key"""
+    return re.sub(r"[^a-z0-9+#]+", "_", language.strip().lower())
+
+def get_language_leaderboard(language: str) -> Leaderboard:
+    key = language_key(language)
+    if key not in LANGUAGE_LEADERBOARDS:
+        LANGUAGE_LEADERBOARDS[key] = Leaderboard()
+    return LANGUAGE_LEADERBOARDS[key]
+
+def upsert_language_leaderboard_entry(language: str, entry: dict):
+    """Insert or replace a user's entry on a language leaderboard"""
+    get_language_leaderboard(language).upsert(entry)
+
+def rebuild_language_leaderboards():
+    """Rebuild every language leaderboard from users' languageScores"""
+    LANGUAGE_LEADERBOARDS.clear()
+    for user in MOCK_USERS.values():
+        entry = build_leaderboard_entry(user)
+        for key, language_score in user.get("languageScores", {}).items():
+            upsert_language_leaderboard_entry(key, dict(entry, score=language_score))
+
+def record_topic_score(user_id: str, topic_id: str, language: str, score: int):
+    """Keep a user's best score per topic and return the new language total.
+
+    Returns None when the score doesn't improve on the user's best for the
+    topic (the language total is unchanged).
+    """
+    user = MOCK_USERS.get(user_id)
+    if not user:
+        return None
+    topic_scores = user.setdefault("topicScores", {})
+    previous = topic_scores.get(topic_id, 0)
+    if topic_id in topic_scores and score <= previous:
+        return None
+    topic_scores[topic_id] = score
+    language_scores = user.setdefault("languageScores", {})
+    key = language_key(language)
+    language_scores[key] = language_scores.get(key, 0) + score - previous
+    return language_scores[key]
+
+def relative_time(timestamp: datetime, now: Optional[datetime] = None) -> str:
+    """Human-readable age of a UTC timestamp, in the style of the mock search history"""
+    seconds = ((now or datetime.utcnow()) - timestamp).total_seconds()
+    if seconds < 60:
+        return "Just now"
+    if seconds < 3600:
+        minutes = int(seconds // 60)
+        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+    if seconds < 86400:
+        hours = int(seconds // 3600)
+        return f"{hours} hour{'s' if hours != 1 else ''} ago"
+    days = int(seconds // 86400)
+    return "Yesterday" if days == 1 else f"{days} days ago"
 
 def get_user_search_history(user_id: str):
-    return MOCK_SEARCH_HISTORY.get(user_id, [])
+    return list(MOCK_SEARCH_HISTORY.get(user_id, ()))
 
 def add_search_query(user_id: str, query: str):
-    if user_id not in MOCK_SEARCH_HISTORY:
-        MOCK_SEARCH_HISTORY[user_id] = []
-    MOCK_SEARCH_HISTORY[user_id].insert(0, {"query": query, "time": "Just now"})
-    # Keep only last 10 searches
-    MOCK_SEARCH_HISTORY[user_id] = MOCK_SEARCH_HISTORY[user_id][:10]
+    history = MOCK_SEARCH_HISTORY.get(user_id)
+    if history is None:
+        history = MOCK_SEARCH_HISTORY[user_id] = deque(maxlen=SEARCH_HISTORY_LIMIT)
+    history.appendleft({"query": query, "time": "Just now"})
+
+def clear_search_history(user_id: str):
+    if user_id in MOCK_SEARCH_HISTORY:
+        MOCK_SEARCH_HISTORY[user_id].clear()
+
+def replace_topic_videos(topic_id: str, language: str, videos: List[Dict[str, Any]]) -> int:
+    """Replace a topic's indexed videos; ones already indexed under another topic are skipped"""
+    for key in [key for key in MOCK_VIDEO_INDEX if key[1] == topic_id]:
+        del MOCK_VIDEO_INDEX[key]
+    claimed = {video["youtubeId"] for indexed in MOCK_VIDEO_INDEX.values() for video in indexed}
+    kept = [dict(video) for video in videos if video["youtubeId"] not in claimed]
+    MOCK_VIDEO_INDEX[(language, topic_id)] = kept
+    return len(kept)
+
+def get_topic_videos(keys: List[Tuple[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        topic_id: list(MOCK_VIDEO_INDEX[(language, topic_id)])
+        for language, topic_id in keys
+        if (language, topic_id) in MOCK_VIDEO_INDEX
+    }
 
 def update_user_topic_progress(user_id: str, topic_id: str, status: str, score: int = None):
     user = MOCK_USERS.get(user_id)
@@ -227,10 +364,20 @@ def add_watched_video(user_id: str, video_data: dict):
     user["videosWatched"].append(video_data)
     return True
 
-def create_user(email: str, name: str, hashed_password: str) -> str:
+def add_user(user: dict) -> Optional[str]:
+    """Store a fully-built user record and index its email (None if the email is taken)"""
+    email = normalize_email(user["email"])
+    if email in MOCK_EMAIL_INDEX:
+        return None
+    user_id = user["id"]
+    MOCK_USERS[user_id] = user
+    MOCK_EMAIL_INDEX[email] = user_id
+    return user_id
+
+def create_user(email: str, name: str, hashed_password: str) -> Optional[str]:
     """Create a new user with hashed password"""
     user_id = f"user-{len(MOCK_USERS) + 1}"
-    MOCK_USERS[user_id] = {
+    user = {
         "id": user_id,
         "name": name,
         "email": email,
@@ -239,13 +386,33 @@ def create_user(email: str, name: str, hashed_password: str) -> str:
         "pendingTopics": [],
         "inProgressTopics": [],
         "videosWatched": [],
+        "topicScores": {},
+        "languageScores": {},
         "totalScore": 0,
-        "rank": len(MOCK_USERS) + 1,
+        "rank": 0,
         "preferredStyle": "visual",
         "confusionCount": 0
     }
+    # Only a user that was actually added gets a leaderboard entry
+    if add_user(user) is None:
+        return None
+    upsert_leaderboard_entry(build_leaderboard_entry(user))
+    user["rank"] = LEADERBOARD_INDEX.rank_of(user_id)
     return user_id
 
+def update_user_email(user_id: str, email: str) -> bool:
+    """Change a user's email, keeping the email index in sync"""
+    user = MOCK_USERS.get(user_id)
+    if not user:
+        return False
+    owner = MOCK_EMAIL_INDEX.get(normalize_email(email))
+    if owner is not None and owner != user_id:
+        return False
+    MOCK_EMAIL_INDEX.pop(normalize_email(user["email"]), None)
+    user["email"] = email
+    MOCK_EMAIL_INDEX[normalize_email(email)] = user_id
+    return True
+
 def update_user_password(user_id: str, hashed_password: str) -> bool:
     """Update user password with new hashed password"""
     user = MOCK_USERS.get(user_id)
@@ -256,4 +423,7 @@ def update_user_password(user_id: str, hashed_password: str) -> bool:
 
 def user_exists(email: str) -> bool:
     """Check if user exists by email"""
-    return get_user_by_email(email) is not None
\ No newline at end of file
+    return normalize_email(email) in MOCK_EMAIL_INDEX
+
+rebuild_email_index()
+rebuild_language_leaderboards()
\ No newline at end of file
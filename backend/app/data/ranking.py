@@ -0,0 +1,293 @@
+"""
+In-memory ranked leaderboard index
+
+An indexable skiplist keeps entries ordered by (score desc, userId asc) and
+stores the span of every forward link, so rank lookup, positional access and
+insert/remove are all O(log n) and slicing k entries is O(log n + k).
+"""
+
+import random
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+MAX_LEVEL = 32
+
+# Sort key: higher score first, ties broken by userId ascending
+RankKey = Tuple[float, str]
+
+
+def rank_key(score: float, user_id: str) -> RankKey:
+    return (-score, user_id)
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Optional[RankKey], level: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * level
+        self.width: List[int] = [1] * level
+
+
+class RankedIndex:
+    """Indexable skiplist of unique sort keys"""
+
+    def __init__(self):
+        self._head = _Node(None, MAX_LEVEL)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _random_level() -> int:
+        level = 1
+        while level < MAX_LEVEL and random.random() < 0.5:
+            level += 1
+        return level
+
+    def _find_chain(self, key: RankKey) -> Tuple[List[_Node], List[int]]:
+        """Rightmost node before key on every level, and the steps taken per level"""
+        chain: List[_Node] = [self._head] * MAX_LEVEL
+        steps = [0] * MAX_LEVEL
+        node = self._head
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        return chain, steps
+
+    def insert(self, key: RankKey):
+        chain, steps_at_level = self._find_chain(key)
+        level = self._random_level()
+        new_node = _Node(key, level)
+        steps = 0
+        for i in range(level):
+            prev = chain[i]
+            new_node.next[i] = prev.next[i]
+            prev.next[i] = new_node
+            new_node.width[i] = prev.width[i] - steps
+            prev.width[i] = steps + 1
+            steps += steps_at_level[i]
+        for i in range(level, MAX_LEVEL):
+            chain[i].width[i] += 1
+        self._size += 1
+
+    def remove(self, key: RankKey):
+        chain, _ = self._find_chain(key)
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for i in range(len(target.next)):
+            prev = chain[i]
+            prev.width[i] += target.width[i] - 1
+            prev.next[i] = target.next[i]
+        for i in range(len(target.next), MAX_LEVEL):
+            chain[i].width[i] -= 1
+        self._size -= 1
+
+    def count_before(self, key: RankKey) -> int:
+        """Number of keys that sort strictly before key"""
+        _, steps = self._find_chain(key)
+        return sum(steps)
+
+    def _node_at(self, index: int) -> Optional[_Node]:
+        if index < 0 or index >= self._size:
+            return None
+        node = self._head
+        remaining = index + 1
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node
+
+    def slice_after(self, key: RankKey, count: int) -> Tuple[int, List[RankKey]]:
+        """Up to count keys sorting strictly after key, plus the position of the first.
+
+        This is the keyset seek used for cursor pagination: it costs
+        O(log n + count) however deep the cursor is.
+        """
+        chain, steps = self._find_chain(key)
+        position = sum(steps)
+        node = chain[0].next[0]
+        if node is not None and node.key == key:
+            node = node.next[0]
+            position += 1
+        keys: List[RankKey] = []
+        while node is not None and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return position, keys
+
+    def slice(self, start: int, count: int) -> List[RankKey]:
+        """Up to count keys starting at position start"""
+        keys: List[RankKey] = []
+        node = self._node_at(max(0, start))
+        while node is not None and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class Leaderboard:
+    """Ranked leaderboard entries backed by a RankedIndex.
+
+    Entries use the API shape (userId, name, score, topicsCompleted, avatar);
+    ``rank`` is derived from the index on read rather than stored.
+    """
+
+    def __init__(self, entries: Optional[List[Dict[str, Any]]] = None):
+        self._index = RankedIndex()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        for entry in entries or []:
+            self.upsert(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(entry: Dict[str, Any]) -> RankKey:
+        return rank_key(entry["score"], entry["userId"])
+
+    def _with_rank(self, key: RankKey, rank: int) -> Dict[str, Any]:
+        return {"rank": rank, **self._entries[key[1]]}
+
+    def upsert(self, entry: Dict[str, Any]):
+        """Insert or replace an entry, re-ranking in O(log n)"""
+        entry = {k: v for k, v in entry.items() if k != "rank"}
+        with self._lock:
+            existing = self._entries.get(entry["userId"])
+            if existing is not None:
+                self._index.remove(self._key(existing))
+            self._entries[entry["userId"]] = entry
+            self._index.insert(self._key(entry))
+
+    def add_score(self, entry: Dict[str, Any], delta: float) -> float:
+        """Add delta to a user's score (creating the entry at 0) and return the new score"""
+        entry = {k: v for k, v in entry.items() if k != "rank"}
+        with self._lock:
+            existing = self._entries.get(entry["userId"])
+            score = delta
+            if existing is not None:
+                self._index.remove(self._key(existing))
+                score += existing["score"]
+            entry["score"] = score
+            self._entries[entry["userId"]] = entry
+            self._index.insert(self._key(entry))
+            return score
+
+    def remove(self, user_id: str) -> bool:
+        with self._lock:
+            existing = self._entries.pop(user_id, None)
+            if existing is None:
+                return False
+            self._index.remove(self._key(existing))
+            return True
+
+    def rank_of(self, user_id: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            return self._index.count_before(self._key(entry)) + 1
+
+    def get_entry(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """A user's entry with its current rank"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            key = self._key(entry)
+            return self._with_rank(key, self._index.count_before(key) + 1)
+
+    def page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Entries ranked offset+1 .. offset+limit"""
+        with self._lock:
+            keys = self._index.slice(offset, limit)
+            return [self._with_rank(key, offset + i + 1) for i, key in enumerate(keys)]
+
+    def page_after(self, score: float, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Entries ranked after the (score, userId) cursor"""
+        with self._lock:
+            position, keys = self._index.slice_after(rank_key(score, user_id), limit)
+            return [self._with_rank(key, position + i + 1) for i, key in enumerate(keys)]
+
+    def top(self, count: int) -> List[Dict[str, Any]]:
+        return self.page(0, count)
+
+    def around(self, user_id: str, radius: int) -> List[Dict[str, Any]]:
+        """A user's entry plus up to radius neighbours on each side"""
+        rank = self.rank_of(user_id)
+        if rank is None:
+            return []
+        start = max(0, rank - 1 - radius)
+        return self.page(start, rank - 1 - start + radius + 1)
+
+
+# Time-windowed leaderboards ------------------------------------------------
+
+PERIODS = ("daily", "weekly", "monthly")
+
+
+def bucket_bounds(period: str, now: Optional[datetime] = None) -> Tuple[str, datetime, datetime]:
+    """Bucket id plus UTC start/end of the period containing now"""
+    now = now or datetime.utcnow()
+    day = datetime(now.year, now.month, now.day)
+    if period == "daily":
+        return day.strftime("%Y-%m-%d"), day, day + timedelta(days=1)
+    if period == "weekly":
+        start = day - timedelta(days=day.weekday())
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}", start, start + timedelta(days=7)
+    if period == "monthly":
+        start = datetime(now.year, now.month, 1)
+        end = datetime(now.year + (now.month == 12), now.month % 12 + 1, 1)
+        return start.strftime("%Y-%m"), start, end
+    raise ValueError(f"Unknown leaderboard period: {period}")
+
+
+def previous_bucket(period: str, now: Optional[datetime] = None) -> str:
+    """Bucket id of the period before the one containing now"""
+    _, start, _ = bucket_bounds(period, now)
+    return bucket_bounds(period, start - timedelta(seconds=1))[0]
+
+
+def bucket_expiry(period: str, now: Optional[datetime] = None) -> datetime:
+    """When a bucket can be dropped: one full period after it closes, so the
+    previous window stays queryable"""
+    _, start, end = bucket_bounds(period, now)
+    return end + (end - start)
+
+
+class WindowedLeaderboards:
+    """Rolling per-period score buckets, each a ranked Leaderboard.
+
+    Only the current and previous bucket of each period are kept; older
+    buckets are dropped as new ones open, so memory stays bounded and queries
+    for the current window never touch raw quiz history.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, Dict[str, Leaderboard]] = {period: {} for period in PERIODS}
+        self._lock = threading.Lock()
+
+    def _roll(self, period: str, now: Optional[datetime] = None):
+        keep = {bucket_bounds(period, now)[0], previous_bucket(period, now)}
+        for bucket in list(self._buckets[period]):
+            if bucket not in keep:
+                del self._buckets[period][bucket]
+
+    def get(self, period: str, bucket: str) -> Leaderboard:
+        with self._lock:
+            self._roll(period)
+            return self._buckets[period].get(bucket) or Leaderboard()
+
+    def add_score(self, period: str, bucket: str, entry: Dict[str, Any], delta: float) -> float:
+        with self._lock:
+            self._roll(period)
+            board = self._buckets[period].setdefault(bucket, Leaderboard())
+        return board.add_score(entry, delta)
@@ -0,0 +1,126 @@
+"""
+Repository layer
+
+Routes read and write through ``repositories`` instead of touching the
+MOCK_* dicts directly. Each collection is served by either the in-memory
+mock backend or MongoDB (Motor), selected per collection in Settings, so
+the API can run across several workers against a shared database while
+the mock stays available for local development and tests.
+"""
+
+from typing import Dict, Any, List, Optional
+import logging
+from app.core.config import Settings
+from app.data import build_leaderboard_entry
+from app.data.ranking import PERIODS, bucket_bounds, bucket_expiry
+from app.services.leaderboard_stream import leaderboard_stream
+from app.repositories.base import (
+    UserRepository, TopicRepository, LeaderboardRepository, SearchHistoryRepository, VideoIndexRepository
+)
+from app.repositories.mock import (
+    MockUserRepository, MockTopicRepository, MockLeaderboardRepository, MockSearchHistoryRepository,
+    MockVideoIndexRepository
+)
+from app.repositories.mongo import (
+    MongoUserRepository, MongoTopicRepository, MongoLeaderboardRepository, MongoSearchHistoryRepository,
+    MongoVideoIndexRepository
+)
+
+logger = logging.getLogger(__name__)
+
+_BACKENDS = {
+    "users": {"mock": MockUserRepository, "mongo": MongoUserRepository},
+    "topics": {"mock": MockTopicRepository, "mongo": MongoTopicRepository},
+    "leaderboard": {"mock": MockLeaderboardRepository, "mongo": MongoLeaderboardRepository},
+    "search_history": {"mock": MockSearchHistoryRepository, "mongo": MongoSearchHistoryRepository},
+    "videos": {"mock": MockVideoIndexRepository, "mongo": MongoVideoIndexRepository},
+}
+
+
+class Repositories:
+    """Active repository per collection (mock until configured otherwise)"""
+
+    def __init__(self):
+        self.users: UserRepository = MockUserRepository()
+        self.topics: TopicRepository = MockTopicRepository()
+        self.leaderboard: LeaderboardRepository = MockLeaderboardRepository()
+        self.search_history: SearchHistoryRepository = MockSearchHistoryRepository()
+        self.videos: VideoIndexRepository = MockVideoIndexRepository()
+        self.backends: Dict[str, str] = {name: "mock" for name in _BACKENDS}
+        # Collections configured for mongo but running on the mock fallback
+        self.degraded: List[str] = []
+
+
+repositories = Repositories()
+
+
+def configure_repositories(settings: Settings, mongo_connected: bool) -> Dict[str, str]:
+    """Select each collection's backend from settings.
+
+    Collections configured for "mongo" fall back to the mock backend when
+    MongoDB is not connected and are listed in ``repositories.degraded``,
+    which makes /health report the process unhealthy. Call again after a
+    successful reconnect to move them onto MongoDB; collections whose backend
+    does not change keep their instance (and any buffered writes).
+    """
+    requested = {
+        "users": settings.USERS_BACKEND,
+        "topics": settings.TOPICS_BACKEND,
+        "leaderboard": settings.LEADERBOARD_BACKEND,
+        "search_history": settings.SEARCH_HISTORY_BACKEND,
+        "videos": settings.VIDEOS_BACKEND,
+    }
+    
+    degraded = []
+    for name, backend in requested.items():
+        backend = backend.strip().lower()
+        if backend not in _BACKENDS[name]:
+            logger.warning(f"⚠️  Unknown backend '{backend}' for {name}, using mock")
+            backend = "mock"
+        if backend == "mongo" and not mongo_connected:
+            logger.error(f"❌ {name} configured for mongo but MongoDB is not connected, using mock (process unhealthy)")
+            backend = "mock"
+            degraded.append(name)
+        
+        if repositories.backends[name] != backend:
+            setattr(repositories, name, _BACKENDS[name][backend]())
+            repositories.backends[name] = backend
+    
+    repositories.degraded = degraded
+    
+    return dict(repositories.backends)
+
+
+async def upsert_leaderboard_entry(user: Dict[str, Any]) -> None:
+    """Write a user's leaderboard entry and notify live leaderboard subscribers"""
+    await repositories.leaderboard.upsert_entry(build_leaderboard_entry(user))
+    leaderboard_stream.notify()
+
+
+async def record_topic_progress(
+    user_id: str, topic_id: str, status: str, score: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """Update a user's topic progress and keep their leaderboard entry in sync"""
+    user = await repositories.users.update_topic_progress(user_id, topic_id, status, score)
+    if user is not None and status == "completed" and score:
+        await upsert_leaderboard_entry(user)
+        await record_window_score(user, score)
+    return user
+
+
+async def record_window_score(user: Dict[str, Any], score: int) -> None:
+    """Add a score gain to the user's current daily, weekly and monthly buckets"""
+    entry = build_leaderboard_entry(user)
+    for period in PERIODS:
+        bucket = bucket_bounds(period)[0]
+        await repositories.leaderboard.add_window_score(period, bucket, entry, score, bucket_expiry(period))
+
+
+async def record_quiz_score(user: Dict[str, Any], topic: Dict[str, Any], score: int) -> None:
+    """Record a quiz score and update the user's language leaderboard entry if it improved"""
+    language_score = await repositories.users.record_topic_score(
+        user["id"], topic["id"], topic["language"], score
+    )
+    if language_score is not None:
+        entry = dict(build_leaderboard_entry(user), score=language_score)
+        await repositories.leaderboard.upsert_language_entry(topic["language"], entry)
@@ -0,0 +1,157 @@
+"""
+Async repository interfaces shared by the mock and MongoDB backends
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+
+class UserRepository(ABC):
+    @abstractmethod
+    async def get_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a user by id"""
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Get a user by (case-insensitive) email"""
+
+    @abstractmethod
+    async def exists(self, email: str) -> bool:
+        """Check if a user with this email exists"""
+
+    @abstractmethod
+    async def add(self, user: Dict[str, Any]) -> Optional[str]:
+        """Store a new user record and return its id (None if the email is already taken)"""
+
+    @abstractmethod
+    async def update_profile(self, user_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update simple profile fields and return the updated user"""
+
+    @abstractmethod
+    async def update_email(self, user_id: str, email: str) -> bool:
+        """Change a user's email; False if the user is missing or the email is taken"""
+
+    @abstractmethod
+    async def update_password(self, user_id: str, hashed_password: str) -> bool:
+        """Replace a user's password hash"""
+
+    @abstractmethod
+    async def update_topic_progress(
+        self, user_id: str, topic_id: str, status: str, score: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Move a topic between progress lists and return the updated user"""
+
+    @abstractmethod
+    async def record_topic_score(
+        self, user_id: str, topic_id: str, language: str, score: int
+    ) -> Optional[int]:
+        """Keep the user's best quiz score per topic; return the new language total if it changed"""
+
+    @abstractmethod
+    async def add_watched_video(self, user_id: str, video_data: Dict[str, Any]) -> bool:
+        """Append a video to the user's watch history"""
+
+
+class TopicRepository(ABC):
+    @abstractmethod
+    async def get_by_id(self, topic_id: str) -> Optional[Dict[str, Any]]:
+        """Get a topic by id"""
+
+    @abstractmethod
+    async def list_all(self) -> List[Dict[str, Any]]:
+        """Get all topics"""
+
+
+class LeaderboardRepository(ABC):
+    @abstractmethod
+    async def count(self) -> int:
+        """Number of ranked users"""
+
+    @abstractmethod
+    async def get_entry(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """A user's entry with its current rank, or None if unranked"""
+
+    @abstractmethod
+    async def page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Entries ranked offset+1 .. offset+limit"""
+
+    @abstractmethod
+    async def page_after(
+        self, score: float, user_id: str, rank: int, limit: int
+    ) -> List[Dict[str, Any]]:
+        """Keyset page: entries ordered after the (score, user_id) cursor, whose rank was rank"""
+
+    @abstractmethod
+    async def top(self, count: int) -> List[Dict[str, Any]]:
+        """The top count entries"""
+
+    @abstractmethod
+    async def around(self, user_id: str, radius: int) -> List[Dict[str, Any]]:
+        """A user's entry plus up to radius neighbours on each side"""
+
+    async def change_marker(self) -> Any:
+        """Value that changes whenever rankings change, for polling across processes
+        (None when changes are only signalled in-process)"""
+        return None
+
+    @abstractmethod
+    async def upsert_entry(self, entry: Dict[str, Any]) -> None:
+        """Insert or replace a user's leaderboard entry"""
+
+    @abstractmethod
+    async def language_count(self, language: str) -> int:
+        """Number of users ranked for a language"""
+
+    @abstractmethod
+    async def language_page(self, language: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Language leaderboard entries ranked offset+1 .. offset+limit"""
+
+    @abstractmethod
+    async def upsert_language_entry(self, language: str, entry: Dict[str, Any]) -> None:
+        """Insert or replace a user's entry on a language leaderboard (score = language score)"""
+
+    @abstractmethod
+    async def add_window_score(
+        self, period: str, bucket: str, entry: Dict[str, Any], delta: int, expires_at: datetime
+    ) -> None:
+        """Add score to a user's entry in a time-window bucket"""
+
+    @abstractmethod
+    async def window_count(self, period: str, bucket: str) -> int:
+        """Number of users ranked in a time-window bucket"""
+
+    @abstractmethod
+    async def window_page(self, period: str, bucket: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Time-window bucket entries ranked offset+1 .. offset+limit"""
+
+    @abstractmethod
+    async def window_entry(self, period: str, bucket: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """A user's entry and rank in a time-window bucket"""
+
+
+class SearchHistoryRepository(ABC):
+    @abstractmethod
+    async def get_recent(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get a user's most recent searches, newest first"""
+
+    @abstractmethod
+    async def add(self, user_id: str, query: str) -> None:
+        """Record a search query"""
+
+    @abstractmethod
+    async def clear(self, user_id: str) -> None:
+        """Delete a user's search history"""
+
+    async def flush(self) -> None:
+        """Persist any buffered writes (called on shutdown)"""
+
+
+class VideoIndexRepository(ABC):
+    @abstractmethod
+    async def replace_topic(self, topic_id: str, language: str, videos: List[Dict[str, Any]]) -> int:
+        """Replace a topic's ranked videos; returns how many were indexed"""
+
+    @abstractmethod
+    async def get_topics(self, keys: List[Tuple[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Ranked videos per topic id for (language, topic_id) keys"""
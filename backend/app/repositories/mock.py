@@ -0,0 +1,127 @@
+"""
+In-memory repository backend over the MOCK_* dicts in app.data
+"""
+
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from app import data
+from app.repositories.base import (
+    UserRepository, TopicRepository, LeaderboardRepository, SearchHistoryRepository, VideoIndexRepository
+)
+
+
+class MockUserRepository(UserRepository):
+    async def get_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return data.get_user_by_id(user_id)
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        return data.get_user_by_email(email)
+
+    async def exists(self, email: str) -> bool:
+        return data.user_exists(email)
+
+    async def add(self, user: Dict[str, Any]) -> Optional[str]:
+        return data.add_user(user)
+
+    async def update_profile(self, user_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        user = data.get_user_by_id(user_id)
+        if not user:
+            return None
+        user.update(fields)
+        return user
+
+    async def update_email(self, user_id: str, email: str) -> bool:
+        return data.update_user_email(user_id, email)
+
+    async def update_password(self, user_id: str, hashed_password: str) -> bool:
+        return data.update_user_password(user_id, hashed_password)
+
+    async def update_topic_progress(
+        self, user_id: str, topic_id: str, status: str, score: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        if not data.update_user_topic_progress(user_id, topic_id, status, score):
+            return None
+        return data.get_user_by_id(user_id)
+
+    async def record_topic_score(
+        self, user_id: str, topic_id: str, language: str, score: int
+    ) -> Optional[int]:
+        return data.record_topic_score(user_id, topic_id, language, score)
+
+    async def add_watched_video(self, user_id: str, video_data: Dict[str, Any]) -> bool:
+        return data.add_watched_video(user_id, video_data)
+
+
+class MockTopicRepository(TopicRepository):
+    async def get_by_id(self, topic_id: str) -> Optional[Dict[str, Any]]:
+        return data.get_topic_by_id(topic_id)
+
+    async def list_all(self) -> List[Dict[str, Any]]:
+        return data.get_all_topics()
+
+
+class MockLeaderboardRepository(LeaderboardRepository):
+    async def count(self) -> int:
+        return len(data.LEADERBOARD_INDEX)
+
+    async def get_entry(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return data.LEADERBOARD_INDEX.get_entry(user_id)
+
+    async def page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        return data.LEADERBOARD_INDEX.page(offset, limit)
+
+    async def page_after(
+        self, score: float, user_id: str, rank: int, limit: int
+    ) -> List[Dict[str, Any]]:
+        return data.LEADERBOARD_INDEX.page_after(score, user_id, limit)
+
+    async def top(self, count: int) -> List[Dict[str, Any]]:
+        return data.LEADERBOARD_INDEX.top(count)
+
+    async def around(self, user_id: str, radius: int) -> List[Dict[str, Any]]:
+        return data.LEADERBOARD_INDEX.around(user_id, radius)
+
+    async def upsert_entry(self, entry: Dict[str, Any]) -> None:
+        data.upsert_leaderboard_entry(entry)
+
+    async def language_count(self, language: str) -> int:
+        return len(data.get_language_leaderboard(language))
+
+    async def language_page(self, language: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        return data.get_language_leaderboard(language).page(offset, limit)
+
+    async def upsert_language_entry(self, language: str, entry: Dict[str, Any]) -> None:
+        data.upsert_language_leaderboard_entry(language, entry)
+
+    async def add_window_score(
+        self, period: str, bucket: str, entry: Dict[str, Any], delta: int, expires_at: datetime
+    ) -> None:
+        data.WINDOWED_LEADERBOARDS.add_score(period, bucket, entry, delta)
+
+    async def window_count(self, period: str, bucket: str) -> int:
+        return len(data.WINDOWED_LEADERBOARDS.get(period, bucket))
+
+    async def window_page(self, period: str, bucket: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        return data.WINDOWED_LEADERBOARDS.get(period, bucket).page(offset, limit)
+
+    async def window_entry(self, period: str, bucket: str, user_id: str) -> Optional[Dict[str, Any]]:
+        return data.WINDOWED_LEADERBOARDS.get(period, bucket).get_entry(user_id)
+
+
+class MockSearchHistoryRepository(SearchHistoryRepository):
+    async def get_recent(self, user_id: str) -> List[Dict[str, Any]]:
+        return data.get_user_search_history(user_id)
+
+    async def add(self, user_id: str, query: str) -> None:
+        data.add_search_query(user_id, query)
+
+    async def clear(self, user_id: str) -> None:
+        data.clear_search_history(user_id)
+
+
+class MockVideoIndexRepository(VideoIndexRepository):
+    async def replace_topic(self, topic_id: str, language: str, videos: List[Dict[str, Any]]) -> int:
+        return data.replace_topic_videos(topic_id, language, videos)
+
+    async def get_topics(self, keys: List[Tuple[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+        return data.get_topic_videos(keys)
@@ -0,0 +1,498 @@
+"""
+MongoDB repository backend using Motor
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Deque, Set, Tuple
+from pymongo import ReturnDocument, InsertOne, ReplaceOne
+from pymongo.errors import DuplicateKeyError
+from app.core.config import settings
+from app.core.database import get_collection, Collections
+from app.data import normalize_email, language_key, relative_time, SEARCH_HISTORY_LIMIT
+from app.repositories.base import (
+    UserRepository, TopicRepository, LeaderboardRepository, SearchHistoryRepository, VideoIndexRepository
+)
+
+logger = logging.getLogger(__name__)
+
+# Never return Mongo's internal _id to routes
+NO_ID = {"_id": 0}
+
+
+class MongoUserRepository(UserRepository):
+    """Users collection; emails are stored normalized so lookups hit the unique email index"""
+
+    async def get_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        users = await get_collection(Collections.USERS)
+        return await users.find_one({"id": user_id}, NO_ID)
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        users = await get_collection(Collections.USERS)
+        return await users.find_one({"email": normalize_email(email)}, NO_ID)
+
+    async def exists(self, email: str) -> bool:
+        users = await get_collection(Collections.USERS)
+        return await users.find_one({"email": normalize_email(email)}, {"_id": 1}) is not None
+
+    async def add(self, user: Dict[str, Any]) -> Optional[str]:
+        users = await get_collection(Collections.USERS)
+        document = dict(user, email=normalize_email(user["email"]))
+        try:
+            await users.insert_one(document)
+        except DuplicateKeyError:
+            return None
+        return user["id"]
+
+    async def update_profile(self, user_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        users = await get_collection(Collections.USERS)
+        return await users.find_one_and_update(
+            {"id": user_id},
+            {"$set": dict(fields, updatedAt=datetime.utcnow().isoformat())},
+            projection=NO_ID,
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def update_email(self, user_id: str, email: str) -> bool:
+        users = await get_collection(Collections.USERS)
+        try:
+            result = await users.update_one(
+                {"id": user_id},
+                {"$set": {"email": normalize_email(email), "updatedAt": datetime.utcnow().isoformat()}}
+            )
+        except DuplicateKeyError:
+            return False
+        return result.matched_count == 1
+
+    async def update_password(self, user_id: str, hashed_password: str) -> bool:
+        users = await get_collection(Collections.USERS)
+        result = await users.update_one({"id": user_id}, {"$set": {"password": hashed_password}})
+        return result.matched_count == 1
+
+    async def update_topic_progress(
+        self, user_id: str, topic_id: str, status: str, score: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        users = await get_collection(Collections.USERS)
+        
+        # A field can't be pulled from and pushed to in the same update
+        await users.update_one(
+            {"id": user_id},
+            {"$pull": {"completedTopics": topic_id, "pendingTopics": topic_id, "inProgressTopics": topic_id}}
+        )
+        
+        target = {
+            "completed": "completedTopics",
+            "in-progress": "inProgressTopics"
+        }.get(status, "pendingTopics")
+        update: Dict[str, Any] = {
+            "$push": {target: topic_id},
+            "$set": {"updatedAt": datetime.utcnow().isoformat()}
+        }
+        if status == "completed" and score:
+            update["$inc"] = {"totalScore": score}
+        
+        return await users.find_one_and_update(
+            {"id": user_id}, update, projection=NO_ID, return_document=ReturnDocument.AFTER
+        )
+
+    async def record_topic_score(
+        self, user_id: str, topic_id: str, language: str, score: int
+    ) -> Optional[int]:
+        users = await get_collection(Collections.USERS)
+        user = await users.find_one({"id": user_id}, {"_id": 0, "topicScores": 1})
+        if user is None:
+            return None
+        topic_scores = user.get("topicScores", {})
+        previous = topic_scores.get(topic_id, 0)
+        if topic_id in topic_scores and score <= previous:
+            return None
+        
+        # Only apply if the stored best hasn't changed since we read it
+        score_field = f"topicScores.{topic_id}"
+        best_filter = {score_field: previous} if topic_id in topic_scores else {score_field: {"$exists": False}}
+        language_field = f"languageScores.{language_key(language)}"
+        updated = await users.find_one_and_update(
+            {"id": user_id, **best_filter},
+            {"$set": {score_field: score}, "$inc": {language_field: score - previous}},
+            projection={"_id": 0, "languageScores": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if updated is None:
+            return None
+        return updated["languageScores"][language_key(language)]
+
+    async def add_watched_video(self, user_id: str, video_data: Dict[str, Any]) -> bool:
+        users = await get_collection(Collections.USERS)
+        result = await users.update_one({"id": user_id}, {"$push": {"videosWatched": video_data}})
+        return result.matched_count == 1
+
+
+class MongoTopicRepository(TopicRepository):
+    async def get_by_id(self, topic_id: str) -> Optional[Dict[str, Any]]:
+        topics = await get_collection(Collections.TOPICS)
+        return await topics.find_one({"id": topic_id}, NO_ID)
+
+    async def list_all(self) -> List[Dict[str, Any]]:
+        topics = await get_collection(Collections.TOPICS)
+        return await topics.find({}, NO_ID).to_list(length=None)
+
+
+# Rank order: highest score first, ties broken by user_id
+RANK_SORT = [("total_score", -1), ("user_id", 1)]
+
+
+class MongoLeaderboardRepository(LeaderboardRepository):
+    """Leaderboard collection, stored snake_case and mapped to the API entry shape.
+
+    Ranks are computed by counting the documents ahead of a user on the
+    total_score index instead of scanning the collection.
+    """
+
+    @staticmethod
+    def _to_entry(document: Dict[str, Any], rank: int) -> Dict[str, Any]:
+        return {
+            "rank": rank,
+            "userId": document["user_id"],
+            "name": document.get("name", ""),
+            "score": document.get("total_score", 0),
+            "topicsCompleted": document.get("topics_completed", 0),
+            "avatar": document.get("avatar", "")
+        }
+
+    @staticmethod
+    def _ahead_of(document: Dict[str, Any]) -> Dict[str, Any]:
+        score = document.get("total_score", 0)
+        return {"$or": [
+            {"total_score": {"$gt": score}},
+            {"total_score": score, "user_id": {"$lt": document["user_id"]}}
+        ]}
+
+    async def count(self) -> int:
+        leaderboard = await get_collection(Collections.LEADERBOARD)
+        return await leaderboard.estimated_document_count()
+
+    async def _rank_of(self, document: Dict[str, Any]) -> int:
+        leaderboard = await get_collection(Collections.LEADERBOARD)
+        return await leaderboard.count_documents(self._ahead_of(document)) + 1
+
+    async def get_entry(self, user_id: str) -> Optional[Dict[str, Any]]:
+        leaderboard = await get_collection(Collections.LEADERBOARD)
+        document = await leaderboard.find_one({"user_id": user_id}, NO_ID)
+        if document is None:
+            return None
+        return self._to_entry(document, await self._rank_of(document))
+
+    async def page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        leaderboard = await get_collection(Collections.LEADERBOARD)
+        documents = await leaderboard.find({}, NO_ID).sort(RANK_SORT).skip(offset).limit(limit).to_list(length=limit)
+        return [self._to_entry(document, offset + i + 1) for i, document in enumerate(documents)]
+
+    async def page_after(
+        self, score: float, user_id: str, rank: int, limit: int
+    ) -> List[Dict[str, Any]]:
+        # Seek on the (total_score, user_id) index instead of skipping; ranks
+        # continue from the cursor's rank so no count over the skipped range is needed
+        leaderboard = await get_collection(Collections.LEADERBOARD)
+        documents = await leaderboard.find(
+            {"$or": [
+                {"total_score": {"$lt": score}},
+                {"total_score": score, "user_id": {"$gt": user_id}}
+            ]},
+            NO_ID
+        ).sort(RANK_SORT).limit(limit).to_list(length=limit)
+        return [self._to_entry(document, rank + i + 1) for i, document in enumerate(documents)]
+
+    async def top(self, count: int) -> List[Dict[str, Any]]:
+        return await self.page(0, count)
+
+    async def around(self, user_id: str, radius: int) -> List[Dict[str, Any]]:
+        entry = await self.get_entry(user_id)
+        if entry is None:
+            return []
+        start = max(0, entry["rank"] - 1 - radius)
+        return await self.page(start, entry["rank"] - 1 - start + radius + 1)
+
+    async def change_marker(self) -> Any:
+        meta = await get_collection(Collections.LEADERBOARD_META)
+        document = await meta.find_one({"_id": "version"})
+        return document["version"] if document else 0
+
+    async def upsert_entry(self, entry: Dict[str, Any]) -> None:
+        leaderboard = await get_collection(Collections.LEADERBOARD)
+        await leaderboard.update_one(
+            {"user_id": entry["userId"]},
+            {"$set": {
+                "name": entry["name"],
+                "total_score": entry["score"],
+                "topics_completed": entry["topicsCompleted"],
+                "avatar": entry["avatar"],
+                "updated_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+        # Bumped on every write so live streams in any worker can poll one document
+        meta = await get_collection(Collections.LEADERBOARD_META)
+        await meta.update_one({"_id": "version"}, {"$inc": {"version": 1}}, upsert=True)
+
+    @staticmethod
+    def _scored_entry(document: Dict[str, Any], rank: int) -> Dict[str, Any]:
+        """API entry for a language or window document, whose score is its own"""
+        return {
+            "rank": rank,
+            "userId": document["user_id"],
+            "name": document.get("name", ""),
+            "score": document.get("score", 0),
+            "topicsCompleted": document.get("topics_completed", 0),
+            "avatar": document.get("avatar", "")
+        }
+
+    # Language leaderboards live in leaderboard_languages, one document per
+    # (language, user), ranked on the (language, score, user_id) index
+
+    async def language_count(self, language: str) -> int:
+        languages = await get_collection(Collections.LEADERBOARD_LANGUAGES)
+        return await languages.count_documents({"language": language_key(language)})
+
+    async def language_page(self, language: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        languages = await get_collection(Collections.LEADERBOARD_LANGUAGES)
+        documents = await languages.find(
+            {"language": language_key(language)}, NO_ID
+        ).sort([("score", -1), ("user_id", 1)]).skip(offset).limit(limit).to_list(length=limit)
+        return [self._scored_entry(document, offset + i + 1) for i, document in enumerate(documents)]
+
+    async def upsert_language_entry(self, language: str, entry: Dict[str, Any]) -> None:
+        languages = await get_collection(Collections.LEADERBOARD_LANGUAGES)
+        await languages.update_one(
+            {"language": language_key(language), "user_id": entry["userId"]},
+            {"$set": {
+                "name": entry["name"],
+                "score": entry["score"],
+                "topics_completed": entry["topicsCompleted"],
+                "avatar": entry["avatar"],
+                "updated_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+
+    # Time-window buckets live in leaderboard_windows, one document per
+    # (period, bucket, user), expired by a TTL index on expires_at
+
+    async def add_window_score(
+        self, period: str, bucket: str, entry: Dict[str, Any], delta: int, expires_at: datetime
+    ) -> None:
+        windows = await get_collection(Collections.LEADERBOARD_WINDOWS)
+        await windows.update_one(
+            {"period": period, "bucket": bucket, "user_id": entry["userId"]},
+            {
+                "$inc": {"score": delta},
+                "$set": {
+                    "name": entry["name"],
+                    "topics_completed": entry["topicsCompleted"],
+                    "avatar": entry["avatar"],
+                    "expires_at": expires_at
+                }
+            },
+            upsert=True
+        )
+
+    async def window_count(self, period: str, bucket: str) -> int:
+        windows = await get_collection(Collections.LEADERBOARD_WINDOWS)
+        return await windows.count_documents({"period": period, "bucket": bucket})
+
+    async def window_page(self, period: str, bucket: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        windows = await get_collection(Collections.LEADERBOARD_WINDOWS)
+        documents = await windows.find(
+            {"period": period, "bucket": bucket}, NO_ID
+        ).sort([("score", -1), ("user_id", 1)]).skip(offset).limit(limit).to_list(length=limit)
+        return [self._scored_entry(document, offset + i + 1) for i, document in enumerate(documents)]
+
+    async def window_entry(self, period: str, bucket: str, user_id: str) -> Optional[Dict[str, Any]]:
+        windows = await get_collection(Collections.LEADERBOARD_WINDOWS)
+        document = await windows.find_one({"period": period, "bucket": bucket, "user_id": user_id}, NO_ID)
+        if document is None:
+            return None
+        ahead = await windows.count_documents({
+            "period": period,
+            "bucket": bucket,
+            "$or": [
+                {"score": {"$gt": document["score"]}},
+                {"score": document["score"], "user_id": {"$lt": user_id}}
+            ]
+        })
+        return self._scored_entry(document, ahead + 1)
+
+
+class MongoSearchHistoryRepository(SearchHistoryRepository):
+    """Search history with write-behind persistence.
+
+    Recent searches are served from a fixed-capacity ring per user (loaded
+    from Mongo once per user). New searches go into the ring and a pending
+    buffer that a background task writes with unordered bulk inserts, so
+    recording a search costs no database round-trip. Old documents expire
+    through the TTL index on ``timestamp``.
+    """
+
+    def __init__(self):
+        self._recent: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._pending: Deque[Dict[str, Any]] = deque(maxlen=settings.SEARCH_HISTORY_MAX_PENDING)
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        # The loop only holds weak references to tasks; keep flushes alive until done
+        self._flushes: Set[asyncio.Task] = set()
+        self.flushed = 0
+        self.flush_failures = 0
+        self.dropped = 0
+
+    def _remember(self, user_id: str, entries: List[Dict[str, Any]]) -> Deque[Dict[str, Any]]:
+        ring = deque(entries, maxlen=SEARCH_HISTORY_LIMIT)
+        self._recent[user_id] = ring
+        while len(self._recent) > settings.SEARCH_HISTORY_CACHED_USERS:
+            self._recent.popitem(last=False)
+        return ring
+
+    async def _load(self, user_id: str) -> Deque[Dict[str, Any]]:
+        ring = self._recent.get(user_id)
+        if ring is not None:
+            self._recent.move_to_end(user_id)
+            return ring
+        history = await get_collection(Collections.SEARCH_HISTORY)
+        documents = await history.find(
+            {"user_id": user_id}, NO_ID
+        ).sort("timestamp", -1).limit(SEARCH_HISTORY_LIMIT).to_list(length=SEARCH_HISTORY_LIMIT)
+        # Buffered searches are newer than anything already persisted
+        unsaved = [document for document in reversed(self._pending) if document["user_id"] == user_id]
+        return self._remember(user_id, unsaved + documents)
+
+    async def get_recent(self, user_id: str) -> List[Dict[str, Any]]:
+        return [
+            {"query": document["query"], "time": relative_time(document["timestamp"])}
+            for document in await self._load(user_id)
+        ]
+
+    async def add(self, user_id: str, query: str) -> None:
+        document = {"user_id": user_id, "query": query, "timestamp": datetime.utcnow()}
+        ring = self._recent.get(user_id)
+        if ring is not None:
+            ring.appendleft(document)
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+            logger.warning("⚠️  Search history write buffer full, dropping oldest unsaved search")
+        self._pending.append(document)
+
+        if len(self._pending) >= settings.SEARCH_HISTORY_BATCH_SIZE and not self._flushes:
+            flush = asyncio.create_task(self.flush())
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self._pending:
+            await asyncio.sleep(settings.SEARCH_HISTORY_FLUSH_SECONDS)
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(len(self._pending), settings.SEARCH_HISTORY_BATCH_SIZE))]
+                try:
+                    history = await get_collection(Collections.SEARCH_HISTORY)
+                    await history.bulk_write([InsertOne(dict(document)) for document in batch], ordered=False)
+                    self.flushed += len(batch)
+                except Exception as e:
+                    # Keep the batch for the next attempt; if searches arrived meanwhile and the
+                    # buffer can't hold both, drop the oldest (as add() does) rather than the newest
+                    self.flush_failures += 1
+                    logger.error(f"❌ Failed to flush {len(batch)} search history entries: {e}")
+                    overflow = len(batch) - (self._pending.maxlen - len(self._pending))
+                    if overflow > 0:
+                        self.dropped += overflow
+                        batch = batch[overflow:]
+                        logger.warning(f"⚠️  Search history write buffer full, dropping {overflow} oldest unsaved searches")
+                    self._pending.extendleft(reversed(batch))
+                    return
+
+    async def clear(self, user_id: str) -> None:
+        async with self._flush_lock:
+            unsaved = [document for document in self._pending if document["user_id"] != user_id]
+            self._pending.clear()
+            self._pending.extend(unsaved)
+            self._remember(user_id, [])
+            history = await get_collection(Collections.SEARCH_HISTORY)
+            await history.delete_many({"user_id": user_id})
+
+
+class MongoVideoIndexRepository(VideoIndexRepository):
+    """Videos collection as a topic -> ranked videos index, stored snake_case.
+
+    Lookups filter on (language, topic) so they use that compound index.
+    youtube_id is unique, so a video already indexed under another topic
+    stays there.
+    """
+
+    @staticmethod
+    def _to_document(topic_id: str, language: str, rank: int, video: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": video["id"],
+            "youtube_id": video["youtubeId"],
+            "topic": topic_id,
+            "language": language,
+            "rank": rank,
+            "title": video.get("title", ""),
+            "thumbnail": video.get("thumbnail", ""),
+            "duration": video.get("duration", ""),
+            "description": video.get("description", ""),
+            "channel_title": video.get("channelTitle", ""),
+            "view_count": video.get("viewCount", 0),
+            "published_at": video.get("publishedAt", ""),
+            "relevance_score": video.get("relevanceScore", 0),
+            "indexed_at": datetime.utcnow()
+        }
+
+    @staticmethod
+    def _to_video(document: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": document["id"],
+            "title": document.get("title", ""),
+            "language": document["language"],
+            "youtubeId": document["youtube_id"],
+            "thumbnail": document.get("thumbnail", ""),
+            "duration": document.get("duration", ""),
+            "description": document.get("description", ""),
+            "channelTitle": document.get("channel_title", ""),
+            "viewCount": document.get("view_count", 0),
+            "publishedAt": document.get("published_at", ""),
+            "relevanceScore": document.get("relevance_score", 0)
+        }
+
+    async def replace_topic(self, topic_id: str, language: str, videos: List[Dict[str, Any]]) -> int:
+        collection = await get_collection(Collections.VIDEOS)
+        youtube_ids = [video["youtubeId"] for video in videos]
+        claimed = {
+            document["youtube_id"]
+            for document in await collection.find(
+                {"youtube_id": {"$in": youtube_ids}, "topic": {"$ne": topic_id}}, {"_id": 0, "youtube_id": 1}
+            ).to_list(length=None)
+        }
+        kept = [video for video in videos if video["youtubeId"] not in claimed]
+        await collection.delete_many({"topic": topic_id, "youtube_id": {"$nin": [video["youtubeId"] for video in kept]}})
+        if kept:
+            await collection.bulk_write([
+                ReplaceOne({"youtube_id": video["youtubeId"]}, self._to_document(topic_id, language, rank, video), upsert=True)
+                for rank, video in enumerate(kept, start=1)
+            ], ordered=False)
+        return len(kept)
+
+    async def get_topics(self, keys: List[Tuple[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+        if not keys:
+            return {}
+        collection = await get_collection(Collections.VIDEOS)
+        documents = await collection.find(
+            {"$or": [{"language": language, "topic": topic_id} for language, topic_id in keys]}, NO_ID
+        ).to_list(length=None)
+        videos: Dict[str, List[Dict[str, Any]]] = {}
+        for document in sorted(documents, key=lambda document: document.get("rank", 0)):
+            videos.setdefault(document["topic"], []).append(self._to_video(document))
+        return videos
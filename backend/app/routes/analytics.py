@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Query
 from typing import List, Dict, Any, Optional
 from app.models import SuccessResponse
-from app.data import get_user_by_id, get_all_topics
+from app.repositories import repositories
 from app.core.auth import get_current_user_from_token
 from datetime import datetime, timedelta
 import random
@@ -13,7 +13,7 @@ async def get_dashboard_analytics(current_user: dict = Depends(get_current_user_
     """Get analytics data for dashboard"""
     user = current_user
     
-    topics = get_all_topics()
+    topics = await repositories.topics.list_all()
     completed = len(user.get("completedTopics", []))
     in_progress = len(user.get("inProgressTopics", []))
     pending = len(user.get("pendingTopics", []))
@@ -1,18 +1,35 @@
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.security import HTTPAuthorizationCredentials
 from datetime import datetime, timedelta
 from typing import Dict, Any
 from app.models import UserLogin, UserCreate, UserResponse, AuthToken, SuccessResponse, ErrorResponse
-from app.data import get_user_by_email, get_user_by_id, MOCK_USERS
-from app.core.auth import auth_utils, get_current_user_from_token
+from app.data import is_password_hash
+from app.repositories import repositories, upsert_leaderboard_entry
+from app.core.auth import (
+    auth_utils, get_current_user_from_token, password_hasher,
+    security, invalidate_token, token_cache
+)
 from app.core.config import settings
+import hmac
 import uuid
 
 router = APIRouter()
 
+async def _check_password(user: dict, plain_password: str) -> bool:
+    """Verify a login password, hashing plaintext seed passwords on first use"""
+    stored = user["password"]
+    if is_password_hash(stored):
+        return await password_hasher.verify(plain_password, stored)
+    
+    if not hmac.compare_digest(plain_password.encode("utf-8"), stored.encode("utf-8")):
+        return False
+    await repositories.users.update_password(user["id"], await password_hasher.hash(plain_password))
+    return True
+
 @router.post("/login", response_model=AuthToken)
 async def login(credentials: UserLogin):
     """Authenticate user with email and password"""
-    user = get_user_by_email(credentials.email)
+    user = await repositories.users.get_by_email(credentials.email)
     
     if not user:
         raise HTTPException(
@@ -21,7 +38,7 @@ async def login(credentials: UserLogin):
         )
     
     # Verify password
-    if not auth_utils.verify_password(credentials.password, user["password"]):
+    if not await _check_password(user, credentials.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -51,7 +68,7 @@ async def login(credentials: UserLogin):
 async def signup(user_data: UserCreate):
     """Register a new user"""
     # Check if user already exists
-    if get_user_by_email(user_data.email):
+    if await repositories.users.exists(user_data.email):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="User with this email already exists"
@@ -59,7 +76,7 @@ async def signup(user_data: UserCreate):
     
     # Create new user with hashed password
     new_user_id = str(uuid.uuid4())
-    hashed_password = auth_utils.get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     
     new_user = {
         "id": new_user_id,
@@ -70,15 +87,28 @@ async def signup(user_data: UserCreate):
         "pendingTopics": ["topic-1", "topic-2"],
         "inProgressTopics": [],
         "videosWatched": [],
+        "topicScores": {},
+        "languageScores": {},
         "totalScore": 0,
-        "rank": len(MOCK_USERS) + 1,
+        "rank": 0,
         "preferredStyle": "visual",
         "confusionCount": 0,
         "createdAt": datetime.now().isoformat(),
         "updatedAt": datetime.now().isoformat()
     }
     
-    MOCK_USERS[new_user_id] = new_user
+    # The check above is only a fast path; add() enforces uniqueness against
+    # concurrent signups for the same email
+    if await repositories.users.add(new_user) is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists"
+        )
+    
+    # Only a stored user goes on the leaderboard; record their actual rank
+    await upsert_leaderboard_entry(new_user)
+    leaderboard_entry = await repositories.leaderboard.get_entry(new_user_id)
+    new_user["rank"] = leaderboard_entry["rank"] if leaderboard_entry else 0
     
     # Generate access token
     access_token_expires = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -99,8 +129,13 @@ async def signup(user_data: UserCreate):
     )
 
 @router.post("/logout", response_model=SuccessResponse)
-async def logout(current_user: dict = Depends(get_current_user_from_token)):
+async def logout(
+    current_user: dict = Depends(get_current_user_from_token),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
     """Logout user (invalidate token on client side)"""
+    invalidate_token(credentials.credentials)
+    
     return SuccessResponse(
         success=True,
         message="Logged out successfully"
@@ -116,9 +151,13 @@ async def get_current_user(current_user: dict = Depends(get_current_user_from_to
     return UserResponse(**user_data)
 
 @router.post("/refresh", response_model=AuthToken)
-async def refresh_token(current_user: dict = Depends(get_current_user_from_token)):
+async def refresh_token(
+    current_user: dict = Depends(get_current_user_from_token),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
     """Refresh access token"""
     user = current_user
+    invalidate_token(credentials.credentials)
     
     # Create new access token
     access_token_expires = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -138,4 +177,22 @@ async def refresh_token(current_user: dict = Depends(get_current_user_from_token
         token_type="bearer",
         expires_in=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
         user=user_response
+    )
+
+@router.get("/token-cache-stats", response_model=SuccessResponse)
+async def get_token_cache_stats():
+    """Get verified-token cache metrics"""
+    return SuccessResponse(
+        success=True,
+        message="Token cache stats retrieved",
+        data={"tokenCache": token_cache.get_stats()}
+    )
+
+@router.get("/hasher-stats", response_model=SuccessResponse)
+async def get_hasher_stats():
+    """Get password hashing pool metrics"""
+    return SuccessResponse(
+        success=True,
+        message="Password hasher stats retrieved",
+        data={"hasher": password_hasher.get_stats()}
     )
\ No newline at end of file
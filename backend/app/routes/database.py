@@ -3,8 +3,9 @@ Database Testing and Health Check Routes
 """
 
 from fastapi import APIRouter, HTTPException
-from app.core.database import test_connection, connect_to_mongo, db
+from app.core.database import test_connection, connect_to_mongo, get_pool_stats, db
 from app.core.config import Settings
+from app.repositories import configure_repositories
 
 router = APIRouter()
 settings = Settings()
@@ -41,9 +42,12 @@ async def reconnect_database():
         success = await connect_to_mongo(settings)
         
         if success:
+            # Move collections that fell back to mock at startup onto MongoDB
+            backends = configure_repositories(settings, True)
             return {
                 "success": True,
-                "message": "Successfully reconnected to MongoDB"
+                "message": "Successfully reconnected to MongoDB",
+                "backends": backends
             }
         else:
             return {
@@ -80,4 +84,12 @@ async def database_health():
         return {
             "status": "unhealthy", 
             "message": f"MongoDB health check failed: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+@router.get("/pool-stats")
+async def database_pool_stats():
+    """Connection pool diagnostics: checkout wait time, in-use and available connections"""
+    return {
+        "success": True,
+        "pool": get_pool_stats()
+    }
\ No newline at end of file
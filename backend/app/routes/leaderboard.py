@@ -1,35 +1,71 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 from app.models import LeaderboardEntry, SuccessResponse
-from app.data import get_leaderboard, get_user_by_id
+from app.data import build_leaderboard_entry
+from app.repositories import repositories
+from app.services.leaderboard_stream import leaderboard_stream, StreamFullError
+from app.data.ranking import PERIODS, bucket_bounds
 from app.core.auth import get_current_user_from_token
+from datetime import timedelta
+import base64
+import binascii
+import json
 import math
 
 router = APIRouter()
 
+def _encode_cursor(entry: Dict[str, Any]) -> str:
+    """Opaque keyset cursor for the entry a page ended on"""
+    raw = json.dumps({"s": entry["score"], "u": entry["userId"], "r": entry["rank"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return {"score": float(value["s"]), "userId": str(value["u"]), "rank": int(value["r"])}
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid leaderboard cursor"
+        )
+
 @router.get("", response_model=SuccessResponse)
 async def get_global_leaderboard(
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     limit: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
     current_user: dict = Depends(get_current_user_from_token)
 ):
-    """Get global leaderboard with pagination"""
-    leaderboard_data = get_leaderboard()
-    
-    # Calculate pagination
-    total_entries = len(leaderboard_data)
+    """Get global leaderboard with pagination.
+
+    Pass ``cursor`` (the previous page's ``nextCursor``) for keyset pagination
+    on (score, userId): deep pages cost the same as the first, and entries
+    don't shift between pages as scores change.
+    """
+    total_entries = await repositories.leaderboard.count()
     total_pages = math.ceil(total_entries / limit)
-    start_idx = (page - 1) * limit
-    end_idx = start_idx + limit
     
-    paginated_data = leaderboard_data[start_idx:end_idx]
+    if cursor:
+        after = _decode_cursor(cursor)
+        # Fetch one extra entry to know whether another page follows
+        paginated_data = await repositories.leaderboard.page_after(
+            after["score"], after["userId"], after["rank"], limit + 1
+        )
+        has_next = len(paginated_data) > limit
+        paginated_data = paginated_data[:limit]
+        has_previous = True
+        page = math.ceil(paginated_data[0]["rank"] / limit) if paginated_data else total_pages
+    else:
+        # Calculate pagination
+        start_idx = (page - 1) * limit
+        paginated_data = await repositories.leaderboard.page(start_idx, limit)
+        has_next = page < total_pages
+        has_previous = page > 1
     
     # Find current user's position
-    current_user_entry = None
-    for entry in leaderboard_data:
-        if entry["userId"] == current_user["id"]:
-            current_user_entry = entry
-            break
+    current_user_entry = await repositories.leaderboard.get_entry(current_user["id"])
     
     return SuccessResponse(
         success=True,
@@ -40,8 +76,9 @@ async def get_global_leaderboard(
                 "currentPage": page,
                 "totalPages": total_pages,
                 "totalEntries": total_entries,
-                "hasNext": page < total_pages,
-                "hasPrevious": page > 1
+                "hasNext": has_next,
+                "hasPrevious": has_previous,
+                "nextCursor": _encode_cursor(paginated_data[-1]) if has_next and paginated_data else None
             },
             "currentUser": current_user_entry
         }
@@ -53,8 +90,7 @@ async def get_top_users(count: int = 10):
     if count > 100:
         count = 100
     
-    leaderboard_data = get_leaderboard()
-    top_users = leaderboard_data[:count]
+    top_users = await repositories.leaderboard.top(count)
     
     return SuccessResponse(
         success=True,
@@ -65,82 +101,127 @@ async def get_top_users(count: int = 10):
 @router.get("/user-rank", response_model=SuccessResponse)
 async def get_user_rank(current_user: dict = Depends(get_current_user_from_token)):
     """Get current user's rank and nearby users"""
-    leaderboard_data = get_leaderboard()
     user = current_user
     user_id = user["id"]
+    total_entries = await repositories.leaderboard.count()
     
     # Find user's position in leaderboard
-    user_rank = None
-    user_entry = None
+    user_entry = await repositories.leaderboard.get_entry(user_id)
     
-    for i, entry in enumerate(leaderboard_data):
-        if entry["userId"] == user_id:
-            user_rank = i + 1
-            user_entry = entry
-            break
-    
-    if user_rank is None:
+    if user_entry is not None:
+        # Get nearby users (2 above and below)
+        nearby_users = await repositories.leaderboard.around(user_id, 2)
+        ranked = True
+    else:
         # User not in leaderboard yet, create mock entry
-        user_entry = {
-            "rank": len(leaderboard_data) + 1,
-            "userId": user_id,
-            "name": user["name"],
-            "score": user.get("totalScore", 0),
-            "topicsCompleted": len(user.get("completedTopics", [])),
-            "avatar": f"https://api.dicebear.com/7.x/avataaars/svg?seed={user['name']}"
-        }
-        user_rank = user_entry["rank"]
-    
-    # Get nearby users (2 above and below)
-    nearby_users = []
-    start = max(0, user_rank - 3)
-    end = min(len(leaderboard_data), user_rank + 2)
-    
-    for i in range(start, end):
-        if i < len(leaderboard_data):
-            nearby_users.append(leaderboard_data[i])
-    
-    # If user not in main leaderboard, add their entry
-    if user_rank > len(leaderboard_data):
+        entry = build_leaderboard_entry(user)
+        user_entry = {"rank": total_entries + 1, **entry}
+        nearby_users = await repositories.leaderboard.page(max(0, total_entries - 2), 2)
         nearby_users.append(user_entry)
+        ranked = False
     
     return SuccessResponse(
         success=True,
         message="User rank retrieved successfully",
         data={
-            "userRank": user_rank,
+            "userRank": user_entry["rank"],
             "userEntry": user_entry,
             "nearbyUsers": nearby_users,
-            "totalUsers": len(leaderboard_data) + (1 if user_rank > len(leaderboard_data) else 0)
+            "totalUsers": total_entries + (0 if ranked else 1)
         }
     )
 
-@router.get("/language/{language}", response_model=SuccessResponse)
-async def get_language_leaderboard(language: str):
-    """Get leaderboard filtered by programming language"""
-    # This is a mock implementation - in production, you'd filter by actual language performance
-    leaderboard_data = get_leaderboard()
+@router.get("/window/{period}", response_model=SuccessResponse)
+async def get_window_leaderboard(
+    period: str,
+    previous: bool = Query(False, description="Show the previous period instead of the current one"),
+    limit: int = Query(50, ge=1, le=100, description="Number of entries"),
+    current_user: dict = Depends(get_current_user_from_token)
+):
+    """Get the daily, weekly or monthly leaderboard (score gained within the period)"""
+    if period not in PERIODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Period must be one of: daily, weekly, monthly"
+        )
     
-    # Mock filtering by adding language-specific scores
-    language_leaderboard = []
-    for entry in leaderboard_data:
-        # Mock language-specific performance
-        language_score = entry["score"] * 0.8 if language.lower() == "python" else entry["score"] * 0.6
-        
-        language_entry = entry.copy()
-        language_entry["languageScore"] = int(language_score)
-        language_entry["language"] = language
-        language_leaderboard.append(language_entry)
+    bucket, start, end = bucket_bounds(period)
+    if previous:
+        bucket, start, end = bucket_bounds(period, start - timedelta(seconds=1))
     
-    # Sort by language-specific score
-    language_leaderboard.sort(key=lambda x: x["languageScore"], reverse=True)
+    return SuccessResponse(
+        success=True,
+        message=f"{period.title()} leaderboard retrieved successfully",
+        data={
+            "period": period,
+            "bucket": bucket,
+            "startsAt": start.isoformat(),
+            "endsAt": end.isoformat(),
+            "leaderboard": await repositories.leaderboard.window_page(period, bucket, 0, limit),
+            "totalEntries": await repositories.leaderboard.window_count(period, bucket),
+            "currentUser": await repositories.leaderboard.window_entry(period, bucket, current_user["id"])
+        }
+    )
+
+@router.get("/language/{language}", response_model=SuccessResponse)
+async def get_language_leaderboard(language: str):
+    """Get leaderboard ranked by per-language quiz scores"""
+    # Language scores are each user's best quiz score per topic, summed per language
+    language_leaderboard = await repositories.leaderboard.language_page(language, 0, 50)  # Top 50
     
-    # Update ranks
-    for i, entry in enumerate(language_leaderboard):
-        entry["rank"] = i + 1
+    for entry in language_leaderboard:
+        entry["languageScore"] = entry["score"]
+        entry["language"] = language
     
     return SuccessResponse(
         success=True,
         message=f"{language} leaderboard retrieved successfully",
-        data={"leaderboard": language_leaderboard[:50]}  # Top 50
+        data={
+            "leaderboard": language_leaderboard,
+            "totalEntries": await repositories.leaderboard.language_count(language)
+        }
+    )
+
+@router.get("/stream")
+async def stream_leaderboard(
+    request: Request,
+    window: str = Query("top", pattern="^(top|around)$", description="Window: top (top-N) or around (your neighbourhood)"),
+    count: int = Query(10, ge=1, le=100, description="Size of the top-N window"),
+    radius: int = Query(2, ge=1, le=25, description="Neighbours on each side for the around window"),
+    current_user: dict = Depends(get_current_user_from_token)
+):
+    """Server-sent events stream of leaderboard changes for a window.
+
+    Sends a ``snapshot`` event first, then coalesced ``delta`` events with only
+    the entries whose rank or score changed (and ``removed`` user ids that left
+    the window). Clients that fall behind receive ``resync`` and a fresh snapshot.
+    """
+    try:
+        subscription = leaderboard_stream.subscribe(window, count, current_user["id"], radius)
+    except StreamFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many leaderboard subscribers, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    try:
+        await leaderboard_stream.send_snapshot(subscription)
+    except Exception:
+        leaderboard_stream.unsubscribe(subscription)
+        raise
+    
+    return StreamingResponse(
+        leaderboard_stream.events(subscription, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/stream/stats", response_model=SuccessResponse)
+async def get_stream_stats():
+    """Live leaderboard stream diagnostics"""
+    return SuccessResponse(
+        success=True,
+        message="Leaderboard stream stats retrieved",
+        data={"stream": leaderboard_stream.get_stats()}
     )
\ No newline at end of file
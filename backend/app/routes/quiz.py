@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, status, Query
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 from app.models import QuizSubmission, QuizResult, SuccessResponse
-from app.data import get_topic_by_id, get_user_by_id, update_user_topic_progress
+from app.repositories import repositories, record_topic_progress, record_quiz_score
 from app.services.openrouter_service import openrouter_service
 from app.core.auth import get_current_user_from_token
 
@@ -19,7 +19,7 @@ async def submit_quiz(
     current_user: dict = Depends(get_current_user_from_token)
 ):
     """Submit quiz answers and get results with adaptive learning feedback"""
-    topic = get_topic_by_id(submission.topic_id)
+    topic = await repositories.topics.get_by_id(submission.topic_id)
     if not topic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -55,9 +55,12 @@ async def submit_quiz(
     
     # Update user progress
     if percentage >= 70:  # Passing threshold
-        update_user_topic_progress(current_user["id"], submission.topic_id, "completed", score)
+        await record_topic_progress(current_user["id"], submission.topic_id, "completed", score)
     else:
-        update_user_topic_progress(current_user["id"], submission.topic_id, "in-progress")
+        await record_topic_progress(current_user["id"], submission.topic_id, "in-progress")
+    
+    # Update per-language leaderboard with the user's best score for this topic
+    await record_quiz_score(current_user, topic, score)
     
     # Generate personalized feedback using AI
     try:
@@ -99,7 +102,7 @@ async def generate_adaptive_quiz(
     current_user: dict = Depends(get_current_user_from_token)
 ):
     """Generate an adaptive quiz based on user's performance history"""
-    topic = get_topic_by_id(topic_id)
+    topic = await repositories.topics.get_by_id(topic_id)
     if not topic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -179,8 +182,7 @@ async def generate_mock_test(
         if not mock_test.get("questions"):
             # Fallback to mixed questions from existing topics
             fallback_questions = []
-            from app.data import get_all_topics
-            all_topics = get_all_topics()
+            all_topics = await repositories.topics.list_all()
             
             for topic in all_topics[:3]:  # Limit to 3 topics for fallback
                 fallback_questions.extend(topic["quiz"][:5])
@@ -213,7 +215,7 @@ async def get_quiz_results(
     current_user: dict = Depends(get_current_user_from_token)
 ):
     """Get previous quiz results for a topic"""
-    topic = get_topic_by_id(topic_id)
+    topic = await repositories.topics.get_by_id(topic_id)
     if not topic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -2,19 +2,26 @@ from fastapi import APIRouter, HTTPException, Depends, status, Query
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 from app.models import SearchQuery, RecentSearch, SuccessResponse
-from app.data import get_user_search_history, add_search_query, get_all_topics
+from app.repositories import repositories
+from app.services.search_index import topic_search_index
+from app.services.suggestion_index import search_suggestions
+from app.services.trending import trending_searches
+from app.services.search_cache import search_result_cache, cache_key
 from app.core.auth import get_current_user_from_token
 import re
 
 router = APIRouter()
 
+# Relevance multiplier for topics found only through a spelling correction
+FUZZY_PENALTY = 0.8
+
 class SearchRequest(BaseModel):
     query: str
 
 @router.get("/recent", response_model=SuccessResponse)
 async def get_recent_searches(current_user: dict = Depends(get_current_user_from_token)):
     """Get user's recent search history"""
-    search_history = get_user_search_history(current_user["id"])
+    search_history = await repositories.search_history.get_recent(current_user["id"])
     
     return SuccessResponse(
         success=True,
@@ -28,7 +35,8 @@ async def save_search_query(
     current_user: dict = Depends(get_current_user_from_token)
 ):
     """Save a search query to user's history"""
-    add_search_query(current_user["id"], search_request.query)
+    await repositories.search_history.add(current_user["id"], search_request.query)
+    trending_searches.record(search_request.query)
     
     return SuccessResponse(
         success=True,
@@ -41,43 +49,14 @@ async def get_search_suggestions(
     q: str = Query(..., description="Search query for suggestions"),
     limit: int = Query(10, ge=1, le=20, description="Maximum number of suggestions")
 ):
-    """Get search suggestions based on partial query"""
-    topics = get_all_topics()
-    
-    suggestions = []
-    query_lower = q.lower()
-    
-    # Search in topic names and languages
-    for topic in topics:
-        topic_name = topic["topicName"].lower()
-        language = topic["language"].lower()
-        
-        if query_lower in topic_name or query_lower in language:
-            suggestions.append({
-                "suggestion": topic["topicName"],
-                "type": "topic",
-                "language": topic["language"],
-                "topicId": topic["id"]
-            })
-    
-    # Add some generic programming concept suggestions
-    programming_concepts = [
-        "loops", "functions", "variables", "arrays", "objects", "classes",
-        "inheritance", "polymorphism", "recursion", "algorithms", "data structures"
-    ]
-    
-    for concept in programming_concepts:
-        if query_lower in concept.lower() and len(suggestions) < limit:
-            suggestions.append({
-                "suggestion": concept.title(),
-                "type": "concept",
-                "language": "General"
-            })
+    """Get search suggestions based on partial query, most popular first"""
+    await search_suggestions.ensure_fresh()
+    suggestions = search_suggestions.suggest(q, limit)
     
     return SuccessResponse(
         success=True,
         message="Search suggestions retrieved",
-        data={"suggestions": suggestions[:limit]}
+        data={"suggestions": suggestions}
     )
 
 @router.get("/global", response_model=SuccessResponse)
@@ -87,29 +66,54 @@ async def search_content(
     language: Optional[str] = Query(None, description="Filter by programming language"),
     limit: int = Query(20, ge=1, le=50, description="Maximum number of results")
 ):
-    """Global search across all content"""
+    """Global search across all content.
+
+    Responses are cached per normalized (q, category, language, limit) until
+    the topic catalog changes or the entry's TTL passes.
+    """
+    await topic_search_index.ensure_fresh()
+    key = cache_key(q, category, language, limit)
+    filters = {"category": category, "language": language}
+    cached = search_result_cache.get(key, topic_search_index.version)
+    if cached is not None:
+        return SuccessResponse(
+            success=True,
+            message=f"Search results for '{q}'",
+            data={**cached, "query": q, "filters": filters}
+        )
+    
     query_lower = q.lower()
     results = []
+    corrected_query = None
     
-    # Search topics
+    # Search topics (BM25F over names, languages, overviews, explanations and quiz questions)
     if not category or category == "topics":
-        topics = get_all_topics()
-        for topic in topics:
-            if language and topic["language"].lower() != language.lower():
-                continue
-                
-            # Check if query matches topic name, language, or overview
-            topic_text = f"{topic['topicName']} {topic['language']} {topic['overview']}".lower()
-            if query_lower in topic_text:
-                results.append({
-                    "type": "topic",
-                    "id": topic["id"],
-                    "title": topic["topicName"],
-                    "language": topic["language"],
-                    "difficulty": topic["difficulty"],
-                    "overview": topic["overview"][:200] + "..." if len(topic["overview"]) > 200 else topic["overview"],
-                    "relevanceScore": 100 if query_lower in topic["topicName"].lower() else 70
-                })
+        matches = [(topic, score, fields, 1.0) for topic, score, fields in topic_search_index.search(q, language)]
+        
+        # Typo fallback, only when exact terms found too few topics
+        if len(matches) < limit:
+            corrected_query = topic_search_index.correct_query(q)
+            if corrected_query:
+                found = {topic["id"] for topic, _, _, _ in matches}
+                matches += [
+                    (topic, score, fields, FUZZY_PENALTY)
+                    for topic, score, fields in topic_search_index.search(corrected_query, language)
+                    if topic["id"] not in found
+                ]
+        
+        best_score = max((score for _, score, _, _ in matches), default=0)
+        for topic, score, matched_fields, penalty in matches:
+            results.append({
+                "type": "topic",
+                "id": topic["id"],
+                "title": topic["topicName"],
+                "language": topic["language"],
+                "difficulty": topic["difficulty"],
+                "overview": topic["overview"][:200] + "..." if len(topic["overview"]) > 200 else topic["overview"],
+                # Scaled so the best match scores 100, comparable with other result types
+                "relevanceScore": round(100 * penalty * score / best_score, 1),
+                "matchedIn": matched_fields
+            })
     
     # Mock video search results
     if not category or category == "videos":
@@ -141,28 +145,34 @@ async def search_content(
     # Sort by relevance score
     results.sort(key=lambda x: x.get("relevanceScore", 0), reverse=True)
     
+    data = {
+        "query": q,
+        "didYouMean": corrected_query,
+        "totalResults": len(results),
+        "results": results[:limit],
+        "filters": filters
+    }
+    search_result_cache.put(key, topic_search_index.version, data)
+    
     return SuccessResponse(
         success=True,
         message=f"Search results for '{q}'",
-        data={
-            "query": q,
-            "totalResults": len(results),
-            "results": results[:limit],
-            "filters": {
-                "category": category,
-                "language": language
-            }
-        }
+        data=data
+    )
+
+@router.get("/cache-stats", response_model=SuccessResponse)
+async def get_search_cache_stats():
+    """Get search result cache metrics"""
+    return SuccessResponse(
+        success=True,
+        message="Search cache stats retrieved",
+        data={"searchCache": search_result_cache.get_stats(), "searchIndex": topic_search_index.get_stats()}
     )
 
 @router.delete("/recent", response_model=SuccessResponse)
 async def clear_search_history(current_user: dict = Depends(get_current_user_from_token)):
     """Clear user's search history"""
-    # In production, this would clear the user's search history from database
-    from app.data import MOCK_SEARCH_HISTORY
-    user_id = current_user["id"]
-    if user_id in MOCK_SEARCH_HISTORY:
-        MOCK_SEARCH_HISTORY[user_id] = []
+    await repositories.search_history.clear(current_user["id"])
     
     return SuccessResponse(
         success=True,
@@ -170,18 +180,16 @@ async def clear_search_history(current_user: dict = Depends(get_current_user_fro
     )
 
 @router.get("/trending", response_model=SuccessResponse)
-async def get_trending_searches():
-    """Get trending/popular search queries"""
-    trending = [
-        {"query": "Python loops", "count": 145, "trend": "up"},
-        {"query": "Java inheritance", "count": 132, "trend": "up"},
-        {"query": "SQL joins", "count": 98, "trend": "stable"},
-        {"query": "React hooks", "count": 87, "trend": "down"},
-        {"query": "Algorithm complexity", "count": 76, "trend": "up"}
-    ]
-    
+async def get_trending_searches(
+    limit: int = Query(5, ge=1, le=50, description="Number of trending queries")
+):
+    """Get trending/popular search queries.
+
+    ``count`` is the query's decayed search count over the long window;
+    ``trend`` compares its share of recent searches with that long window.
+    """
     return SuccessResponse(
         success=True,
         message="Trending searches retrieved successfully",
-        data={"trending": trending}
+        data={"trending": trending_searches.top(limit), "stats": trending_searches.get_stats()}
     )
\ No newline at end of file
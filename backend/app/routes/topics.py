@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Query
 from typing import List, Dict, Any, Optional
 from app.models import Topic, TopicProgress, TopicStatus, SuccessResponse
-from app.data import get_all_topics, get_topic_by_id, get_user_by_id, update_user_topic_progress
+from app.repositories import repositories, record_topic_progress
 from app.core.auth import get_current_user_from_token
 
 router = APIRouter()
@@ -14,7 +14,7 @@ async def get_topics(
     current_user: dict = Depends(get_current_user_from_token)
 ):
     """Get all topics with user's progress status"""
-    topics = get_all_topics()
+    topics = await repositories.topics.list_all()
     user = current_user
     
     # Add user progress to each topic
@@ -59,7 +59,7 @@ async def get_topic_details(
     current_user: dict = Depends(get_current_user_from_token)
 ):
     """Get detailed information about a specific topic"""
-    topic = get_topic_by_id(topic_id)
+    topic = await repositories.topics.get_by_id(topic_id)
     if not topic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -93,21 +93,21 @@ async def update_topic_status(
     current_user: dict = Depends(get_current_user_from_token)
 ):
     """Update user's progress status for a topic"""
-    topic = get_topic_by_id(topic_id)
+    topic = await repositories.topics.get_by_id(topic_id)
     if not topic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Topic not found"
         )
     
-    success = update_user_topic_progress(
+    updated_user = await record_topic_progress(
         current_user["id"], 
         topic_id, 
         progress.status.value,
         progress.score
     )
     
-    if not success:
+    if not updated_user:
         raise HTTPException(status_code=404, detail="User not found")
     
     return SuccessResponse(
@@ -127,7 +127,7 @@ async def get_personalized_explanation(
     current_user: dict = Depends(get_current_user_from_token)
 ):
     """Get AI-generated personalized explanation for a topic"""
-    topic = get_topic_by_id(topic_id)
+    topic = await repositories.topics.get_by_id(topic_id)
     if not topic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -190,7 +190,7 @@ async def get_personalized_explanation(
 @router.get("/{topic_id}/quiz", response_model=SuccessResponse)
 async def get_topic_quiz(topic_id: str):
     """Get quiz questions for a specific topic"""
-    topic = get_topic_by_id(topic_id)
+    topic = await repositories.topics.get_by_id(topic_id)
     if not topic:
         raise HTTPException(status_code=404, detail="Topic not found")
     
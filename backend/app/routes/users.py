@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from typing import List, Dict, Any
 from app.models import User, UserUpdate, UserStats, SuccessResponse
-from app.data import get_user_by_id, MOCK_USERS
+from app.repositories import repositories
 from app.core.auth import get_current_user_from_token
 
 router = APIRouter()
@@ -24,19 +24,27 @@ async def update_user_profile(
     current_user: dict = Depends(get_current_user_from_token)
 ):
     """Update user profile"""
-    user = get_user_by_id(current_user["id"])
+    user_id = current_user["id"]
+    
+    # Update user data
+    if updates.email is not None and not await repositories.users.update_email(user_id, updates.email):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists"
+        )
+    fields = {}
+    if updates.name is not None:
+        fields["name"] = updates.name
+    if updates.preferred_style is not None:
+        fields["preferredStyle"] = updates.preferred_style
+    
+    user = await repositories.users.update_profile(user_id, fields)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="User not found"
         )
     
-    # Update user data
-    if updates.name is not None:
-        user["name"] = updates.name
-    if updates.preferred_style is not None:
-        user["preferredStyle"] = updates.preferred_style
-    
     # Remove password from response
     user_data = {k: v for k, v in user.items() if k != "password"}
     
@@ -50,6 +58,7 @@ async def update_user_profile(
 async def get_user_stats(current_user: dict = Depends(get_current_user_from_token)):
     """Get user statistics for profile page"""
     user = current_user
+    leaderboard_entry = await repositories.leaderboard.get_entry(user["id"])
     
     # Calculate stats
     stats = {
@@ -60,7 +69,7 @@ async def get_user_stats(current_user: dict = Depends(get_current_user_from_toke
         "streak": 12,
         "totalHours": 34,
         "joinDate": "Jan 2026",
-        "rank": user.get("rank", 3),
+        "rank": leaderboard_entry["rank"] if leaderboard_entry else user.get("rank", 0),
         "badges": [
             {"name": "First Quiz", "icon": "🏅", "earned": True},
             {"name": "Week Streak", "icon": "🔥", "earned": True},
@@ -86,7 +95,7 @@ async def get_user_stats(current_user: dict = Depends(get_current_user_from_toke
 @router.get("/{user_id}/analytics", response_model=SuccessResponse) 
 async def get_user_analytics(user_id: str):
     """Get analytics data for a specific user"""
-    user = get_user_by_id(user_id)
+    user = await repositories.users.get_by_id(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -3,8 +3,10 @@ from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 import asyncio
 from app.models import Video, WatchedVideo, SuccessResponse
-from app.data import get_user_by_id, add_watched_video, MOCK_USERS
-from app.services.youtube_service import youtube_service
+from app.repositories import repositories
+from app.services.youtube_service import youtube_service, trending_queries, TRENDING_RESULTS_PER_QUERY
+from app.services.video_index import topic_video_index
+from app.services.video_prewarmer import video_prewarmer
 from app.core.auth import get_current_user_from_token
 
 router = APIRouter()
@@ -61,54 +63,18 @@ async def get_video_recommendations(
     user = current_user
     
     try:
-        recommendations = []
-        
-        # Get recommendations based on pending and in-progress topics
-        pending_topics = user.get("pendingTopics", [])
-        in_progress_topics = user.get("inProgressTopics", [])
-        
-        # Mock topic names - in production, you'd get these from the topics data
-        topic_names = {
-            "topic-1": "Python Loops",
-            "topic-2": "Java OOP Basics", 
-            "topic-3": "Data Structures",
-            "topic-4": "Algorithms",
-            "topic-5": "SQL Joins"
-        }
-        
-        # Search for videos related to user's current learning path
-        search_topics = []
-        for topic_id in (in_progress_topics + pending_topics)[:3]:
-            if topic_id in topic_names:
-                search_topics.append(topic_names[topic_id])
-        
-        # If no specific topics, recommend general programming videos
-        if not search_topics:
-            search_topics = ["Programming fundamentals", "Code tutorial beginner"]
-        
-        for topic in search_topics[:2]:  # Limit to 2 topics to avoid too many API calls
-            videos = await youtube_service.search_videos(
-                query=topic,
-                max_results=3,
-                duration="medium"
-            )
-            recommendations.extend(videos[:2])  # Take top 2 from each topic
-        
-        # Remove duplicates and limit results
-        seen_ids = set()
-        unique_recommendations = []
-        for video in recommendations:
-            if video["youtubeId"] not in seen_ids and len(unique_recommendations) < limit:
-                seen_ids.add(video["youtubeId"])
-                unique_recommendations.append(video)
+        # Served from the precomputed topic -> video index, no YouTube calls
+        topic_ids = user.get("inProgressTopics", []) + user.get("pendingTopics", [])
+        watched = {video.get("youtubeId") for video in user.get("videosWatched", [])}
+        recommendations, based_on = await topic_video_index.recommend(topic_ids, watched, limit)
         
         return SuccessResponse(
             success=True,
             message="Video recommendations generated",
             data={
-                "recommendations": unique_recommendations,
-                "basedOn": search_topics,
-                "totalRecommendations": len(unique_recommendations)
+                "recommendations": recommendations,
+                "basedOn": based_on,
+                "totalRecommendations": len(recommendations)
             }
         )
         
@@ -154,7 +120,7 @@ async def mark_video_watched(
         "timeWatched": watch_request.time_watched
     }
     
-    success = add_watched_video(current_user["id"], watched_video)
+    success = await repositories.users.add_watched_video(current_user["id"], watched_video)
     
     if not success:
         raise HTTPException(
@@ -168,6 +134,24 @@ async def mark_video_watched(
         data={"watchedVideo": watched_video}
     )
 
+@router.get("/api-stats", response_model=SuccessResponse)
+async def get_youtube_api_stats():
+    """Get YouTube Data API call and latency metrics"""
+    return SuccessResponse(
+        success=True,
+        message="YouTube API stats retrieved",
+        data={
+            "youtube": youtube_service.get_stats(),
+            "cache": youtube_service.cache.get_stats(),
+            "singleFlight": youtube_service.get_flight_stats(),
+            "fanOut": youtube_service.fanout,
+            "detailBatches": youtube_service.get_batch_stats(),
+            "quota": youtube_service.quota.get_stats(),
+            "prewarm": video_prewarmer.get_stats(),
+            "topicIndex": topic_video_index.get_stats()
+        }
+    )
+
 @router.get("/{video_id}/details", response_model=SuccessResponse)
 async def get_video_details(video_id: str):
     """Get detailed information about a specific YouTube video"""
@@ -204,27 +188,11 @@ async def get_trending_videos_by_language(
 ):
     """Get trending educational videos for a specific programming language"""
     try:
-        async def _fetch_trending():
-            # Search for current/popular topics in the language
-            trending_queries = [
-                f"{language} tutorial 2026",
-                f"{language} advanced concepts",
-            ]
-            
-            all_videos = []
-            for query in trending_queries:
-                videos = await youtube_service.search_videos(
-                    query=query,
-                    max_results=5,
-                    duration="medium"
-                )
-                all_videos.extend(videos)
-            return all_videos
-        
-        try:
-            all_videos = await asyncio.wait_for(_fetch_trending(), timeout=15.0)
-        except asyncio.TimeoutError:
-            all_videos = []
+        # Search for current/popular topics in the language, concurrently
+        results = await youtube_service.search_many(
+            trending_queries(language), max_results=TRENDING_RESULTS_PER_QUERY, duration="medium", timeout=15.0
+        )
+        all_videos = [video for videos in results if videos for video in videos]
         
         # Remove duplicates and sort by relevance + view count
         seen_ids = set()
@@ -246,7 +214,8 @@ async def get_trending_videos_by_language(
             data={
                 "language": language,
                 "trendingVideos": unique_videos[:limit],
-                "totalFound": len(unique_videos)
+                "totalFound": len(unique_videos),
+                "partial": any(videos is None for videos in results)
             }
         )
         
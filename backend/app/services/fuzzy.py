@@ -0,0 +1,101 @@
+"""
+Typo tolerance for search: a character-trigram index over a word vocabulary
+with edit-distance re-ranking
+
+Candidate words are those sharing the most trigrams with the misspelling;
+only the best MAX_CANDIDATES of them are checked with a cut-off edit
+distance, so the cost of a correction stays bounded as the vocabulary grows.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import List, Dict, Set, Tuple, Iterable, Optional
+
+MAX_CANDIDATES = 50
+MIN_WORD_LENGTH = 3
+
+
+def trigrams(word: str) -> Set[str]:
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_distance(word: str) -> int:
+    """Allowed edits for a word: one for short words, two otherwise"""
+    return 1 if len(word) <= 5 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Optimal string alignment distance (transpositions count as one edit),
+    or None as soon as it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous_row: Optional[List[int]] = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(row[j] + 1, current[j - 1] + 1, row[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]
+                    and previous_row is not None):
+                current[j] = min(current[j], previous_row[j - 2] + 1)
+        if min(current) > limit:
+            return None
+        previous_row, row = row, current
+    return row[-1] if row[-1] <= limit else None
+
+
+class TrigramIndex:
+    """Trigram -> words postings over a vocabulary"""
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._words: Set[str] = set()
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def add(self, word: str):
+        if len(word) < MIN_WORD_LENGTH or word in self._words:
+            return
+        self._words.add(word)
+        for gram in trigrams(word):
+            self._postings[gram].add(word)
+
+    def corrections(self, word: str, limit: int = 3) -> List[Tuple[str, int]]:
+        """Closest vocabulary words as (word, distance), best first"""
+        if len(word) < MIN_WORD_LENGTH or word in self._words:
+            return []
+        allowed = max_distance(word)
+        overlap: Dict[str, int] = defaultdict(int)
+        for gram in trigrams(word):
+            for candidate in self._postings.get(gram, ()):
+                overlap[candidate] += 1
+        candidates = heapq.nlargest(MAX_CANDIDATES, overlap, key=overlap.get)
+
+        scored = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, allowed)
+            if distance is not None:
+                scored.append((distance, -overlap[candidate], candidate))
+        scored.sort()
+        return [(candidate, distance) for distance, _, candidate in scored[:limit]]
+
+    def correct(self, words: List[str]) -> Tuple[List[str], int]:
+        """Replace unknown words with their best correction; returns the words and total edits"""
+        corrected = []
+        edits = 0
+        for word in words:
+            best = self.corrections(word, limit=1)
+            if best:
+                corrected.append(best[0][0])
+                edits += best[0][1]
+            else:
+                corrected.append(word)
+        return corrected, edits
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class StreamFullError(Exception):
+    """Raised when the subscriber cap has been reached"""
+
+class Subscription:
+    """One client's leaderboard window and its pending outbound messages"""
+
+    def __init__(self, window: str, count: int, user_id: Optional[str], radius: int, queue_size: int):
+        self.window = window  # "top" or "around"
+        self.count = count
+        self.user_id = user_id
+        self.radius = radius
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=queue_size)
+        # What the client last saw; None means it needs a full snapshot
+        self.snapshot: Optional[Dict[str, Tuple[int, Any]]] = None
+        self.dropped = 0
+
+    def push(self, message: Dict[str, Any]):
+        """Queue a message; a slow client that falls behind gets a full resync instead"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.snapshot = None
+            self.queue.put_nowait({"type": "resync"})
+
+class LeaderboardStream:
+    """Pushes coalesced rank/score deltas to subscribed leaderboard windows.
+
+    Score changes only mark the board dirty (or, on a shared backend, move its
+    change marker); on the next tick every subscriber's window is recomputed
+    and diffed against what that client last saw, so a burst of quiz
+    submissions produces at most one delta per client per tick. Ticks with no
+    change cost a single marker read.
+    """
+
+    def __init__(self, max_subscribers: int, tick_seconds: float, queue_size: int):
+        self.max_subscribers = max_subscribers
+        self.tick_seconds = tick_seconds
+        self.queue_size = queue_size
+        self.subscribers: List[Subscription] = []
+        self._dirty = False
+        self._marker: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self.ticks = 0
+        self.deltas_sent = 0
+        self.rejected = 0
+
+    def notify(self):
+        """Mark the leaderboard as changed; deltas go out on the next tick"""
+        self._dirty = True
+
+    def subscribe(self, window: str, count: int, user_id: Optional[str], radius: int) -> Subscription:
+        if len(self.subscribers) >= self.max_subscribers:
+            self.rejected += 1
+            raise StreamFullError()
+
+        subscription = Subscription(window, count, user_id, radius, self.queue_size)
+        self.subscribers.append(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self.subscribers:
+            self.subscribers.remove(subscription)
+
+    async def _window(self, subscription: Subscription, top_cache: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        from app.repositories import repositories
+
+        if subscription.window == "around" and subscription.user_id:
+            return await repositories.leaderboard.around(subscription.user_id, subscription.radius)
+
+        # All top-N subscribers share one fetch of the largest N
+        if "top" not in top_cache:
+            largest = max(s.count for s in self.subscribers if s.window == "top")
+            top_cache["top"] = await repositories.leaderboard.top(largest)
+        return top_cache["top"][:subscription.count]
+
+    async def send_snapshot(self, subscription: Subscription):
+        """Queue the full current window for a new subscriber"""
+        entries = await self._window(subscription, {})
+        subscription.snapshot = {e["userId"]: (e["rank"], e["score"]) for e in entries}
+        subscription.push({"type": "snapshot", "entries": entries})
+
+    async def _tick(self):
+        from app.repositories import repositories
+
+        # Other workers/hosts can change a shared Mongo leaderboard without
+        # notifying this process, so poll its change marker (one cheap read)
+        # and only recompute windows when it has moved
+        marker = await repositories.leaderboard.change_marker()
+        changed_elsewhere = marker != self._marker
+        self._marker = marker
+        refresh_all = self._dirty or changed_elsewhere
+        self._dirty = False
+
+        pending = [s for s in self.subscribers if refresh_all or s.snapshot is None]
+        if not pending:
+            return
+
+        top_cache: Dict[str, List[Dict[str, Any]]] = {}
+        for subscription in pending:
+            entries = await self._window(subscription, top_cache)
+            current = {e["userId"]: (e["rank"], e["score"]) for e in entries}
+            if subscription.snapshot is None:
+                subscription.snapshot = current
+                subscription.push({"type": "snapshot", "entries": entries})
+                continue
+            changed = [e for e in entries if subscription.snapshot.get(e["userId"]) != current[e["userId"]]]
+            removed = [user_id for user_id in subscription.snapshot if user_id not in current]
+            if changed or removed:
+                subscription.snapshot = current
+                subscription.push({"type": "delta", "changed": changed, "removed": removed})
+                self.deltas_sent += 1
+
+    async def _run(self):
+        while self.subscribers:
+            await asyncio.sleep(self.tick_seconds)
+            self.ticks += 1
+            try:
+                await self._tick()
+            except Exception as e:
+                logger.error(f"Leaderboard stream tick failed: {e}")
+
+    async def events(self, subscription: Subscription, is_disconnected):
+        """Yield SSE-formatted messages until the client disconnects"""
+        try:
+            while not await is_disconnected():
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "maxSubscribers": self.max_subscribers,
+            "tickSeconds": self.tick_seconds,
+            "ticks": self.ticks,
+            "deltasSent": self.deltas_sent,
+            "rejected": self.rejected,
+            "droppedMessages": sum(s.dropped for s in self.subscribers)
+        }
+
+# Global instance
+leaderboard_stream = LeaderboardStream(
+    max_subscribers=settings.LEADERBOARD_STREAM_MAX_SUBSCRIBERS,
+    tick_seconds=settings.LEADERBOARD_STREAM_TICK_SECONDS,
+    queue_size=settings.LEADERBOARD_STREAM_QUEUE_SIZE
+)
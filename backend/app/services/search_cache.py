@@ -0,0 +1,90 @@
+"""
+Result cache for /api/search/global
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from app.core.config import settings
+
+CacheKey = Tuple[str, Optional[str], Optional[str], int]
+
+
+def cache_key(query: str, category: Optional[str], language: Optional[str], limit: int) -> CacheKey:
+    """Normalized (query, category, language, limit)"""
+    return (
+        " ".join(query.lower().split()),
+        category.lower() if category else None,
+        language.lower() if language else None,
+        limit
+    )
+
+
+class SearchResultCache:
+    """Bounded TTL/LRU cache of search responses.
+
+    Each entry records the catalog version it was computed against; a lookup
+    under a newer version is a miss, so topic changes invalidate every cached
+    result without walking the cache.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey, version: int) -> Optional[Dict[str, Any]]:
+        """Return the cached response, or None on miss, expiry or a stale catalog version"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            data, entry_version, expires_at = entry
+            if entry_version != version or expires_at <= time.monotonic():
+                del self._entries[key]
+                if entry_version != version:
+                    self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: CacheKey, version: int, data: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (data, version, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+# Global instance
+search_result_cache = SearchResultCache(
+    max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS
+)
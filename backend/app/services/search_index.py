@@ -0,0 +1,232 @@
+"""
+Inverted index over the topic catalog for /api/search/global
+
+Each topic is indexed as one document with separate fields (name, language,
+overview, explanations, quiz questions). Queries walk only the posting lists
+of their terms and rank with BM25F, so cost scales with posting-list length
+rather than catalog size.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import re
+import time
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from app.core.config import settings
+from app.services.fuzzy import TrigramIndex
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[+#]+)?")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for", "from",
+    "how", "in", "into", "is", "it", "of", "on", "or", "that", "the", "this",
+    "to", "what", "when", "which", "with", "you", "your"
+})
+
+# Field boosts: a hit in the topic name counts far more than one in a quiz option
+FIELD_BOOSTS = {
+    "name": 3.0,
+    "language": 2.0,
+    "overview": 1.0,
+    "explanations": 0.7,
+    "quiz": 0.5
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed (keeps c++ / c# intact)"""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def topic_fields(topic: Dict[str, Any]) -> Dict[str, str]:
+    """Searchable text of a topic, per field"""
+    explanations = " ".join(
+        f"{e.get('title', '')} {e.get('content', '')}" for e in topic.get("explanations", [])
+    )
+    quiz = " ".join(
+        " ".join([q.get("question", "")] + [str(option) for option in q.get("options", [])])
+        for q in topic.get("quiz", [])
+    )
+    return {
+        "name": topic.get("topicName", ""),
+        "language": topic.get("language", ""),
+        "overview": topic.get("overview", ""),
+        "explanations": explanations,
+        "quiz": quiz
+    }
+
+
+class InvertedIndex:
+    """Field-aware inverted index with BM25F scoring"""
+
+    def __init__(self, boosts: Dict[str, float]):
+        self.boosts = boosts
+        # term -> doc_id -> field -> term frequency
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(dict)
+        self._lengths: Dict[str, Dict[str, int]] = {}
+        self._total_lengths: Dict[str, int] = defaultdict(int)
+        self._doc_terms: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._postings
+
+    def terms(self) -> Iterable[str]:
+        return self._postings.keys()
+
+    def add(self, doc_id: str, fields: Dict[str, str]):
+        self.remove(doc_id)
+        lengths: Dict[str, int] = {}
+        terms = set()
+        for field, text in fields.items():
+            tokens = tokenize(text)
+            lengths[field] = len(tokens)
+            self._total_lengths[field] += len(tokens)
+            for token in tokens:
+                field_tfs = self._postings[token].setdefault(doc_id, {})
+                field_tfs[field] = field_tfs.get(field, 0) + 1
+                terms.add(token)
+        self._lengths[doc_id] = lengths
+        self._doc_terms[doc_id] = list(terms)
+
+    def remove(self, doc_id: str):
+        lengths = self._lengths.pop(doc_id, None)
+        if lengths is None:
+            return
+        for field, length in lengths.items():
+            self._total_lengths[field] -= length
+        for term in self._doc_terms.pop(doc_id, []):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def search(self, terms: List[str]) -> Dict[str, Tuple[float, List[str]]]:
+        """doc_id -> (BM25F score, matched fields) for documents containing any term"""
+        doc_count = len(self._lengths)
+        if doc_count == 0:
+            return {}
+        average = {field: total / doc_count for field, total in self._total_lengths.items()}
+
+        results: Dict[str, Tuple[float, List[str]]] = {}
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, field_tfs in postings.items():
+                lengths = self._lengths[doc_id]
+                weighted_tf = 0.0
+                for field, tf in field_tfs.items():
+                    norm = 1 - B + B * (lengths[field] / average[field] if average.get(field) else 0)
+                    weighted_tf += self.boosts.get(field, 1.0) * tf / norm
+                score, fields = results.get(doc_id, (0.0, []))
+                results[doc_id] = (
+                    score + idf * weighted_tf * (K1 + 1) / (weighted_tf + K1),
+                    fields + [field for field in field_tfs if field not in fields]
+                )
+        return results
+
+
+class TopicSearchIndex:
+    """Keeps an InvertedIndex in sync with the topic repository.
+
+    Topics are re-read at most every ``refresh_seconds``; only topics whose
+    content changed are re-indexed, and ``version`` is bumped whenever the
+    indexed catalog changes.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.index = InvertedIndex(FIELD_BOOSTS)
+        self.topics: Dict[str, Dict[str, Any]] = {}
+        self._signatures: Dict[str, str] = {}
+        self._synced_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.version = 0
+        self._vocabulary = TrigramIndex()
+        self._vocabulary_version = 0
+
+    @staticmethod
+    def _signature(topic: Dict[str, Any]) -> str:
+        raw = json.dumps(topic, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def upsert_topic(self, topic: Dict[str, Any]) -> bool:
+        """Index a topic if it is new or changed; returns whether anything changed"""
+        signature = self._signature(topic)
+        if self._signatures.get(topic["id"]) == signature:
+            return False
+        self.index.add(topic["id"], topic_fields(topic))
+        self.topics[topic["id"]] = topic
+        self._signatures[topic["id"]] = signature
+        self.version += 1
+        return True
+
+    def remove_topic(self, topic_id: str) -> bool:
+        if topic_id not in self.topics:
+            return False
+        self.index.remove(topic_id)
+        del self.topics[topic_id]
+        del self._signatures[topic_id]
+        self.version += 1
+        return True
+
+    def sync(self, topics: List[Dict[str, Any]]) -> int:
+        """Bring the index in line with the given catalog; returns the number of changed topics"""
+        changed = sum(1 for topic in topics if self.upsert_topic(topic))
+        current = {topic["id"] for topic in topics}
+        changed += sum(1 for topic_id in list(self.topics) if topic_id not in current and self.remove_topic(topic_id))
+        self._synced_at = time.monotonic()
+        return changed
+
+    async def ensure_fresh(self):
+        """Re-sync from the topic repository when the last sync is older than refresh_seconds"""
+        if self._synced_at is not None and time.monotonic() - self._synced_at < self.refresh_seconds:
+            return
+        async with self._lock:
+            if self._synced_at is not None and time.monotonic() - self._synced_at < self.refresh_seconds:
+                return
+            from app.repositories import repositories
+            self.sync(await repositories.topics.list_all())
+
+    def search(self, query: str, language: Optional[str] = None) -> List[Tuple[Dict[str, Any], float, List[str]]]:
+        """(topic, score, matched fields) ranked by BM25F score"""
+        matches = self.index.search(tokenize(query))
+        results = []
+        for topic_id, (score, fields) in matches.items():
+            topic = self.topics[topic_id]
+            if language and topic["language"].lower() != language.lower():
+                continue
+            results.append((topic, score, fields))
+        results.sort(key=lambda result: (-result[1], result[0]["id"]))
+        return results
+
+    def correct_query(self, query: str) -> Optional[str]:
+        """Query with misspelled terms replaced by the closest indexed terms, if any changed"""
+        if self._vocabulary_version != self.version:
+            self._vocabulary = TrigramIndex(self.index.terms())
+            self._vocabulary_version = self.version
+        corrected, edits = self._vocabulary.correct(tokenize(query))
+        return " ".join(corrected) if edits else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self.index),
+            "terms": sum(1 for _ in self.index.terms()),
+            "version": self.version,
+            "refreshSeconds": self.refresh_seconds
+        }
+
+# Global instance
+topic_search_index = TopicSearchIndex(refresh_seconds=settings.SEARCH_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,202 @@
+"""
+Prefix index for /api/search/suggestions
+
+A trie over topic names, languages, programming concepts and popular search
+queries. Every entry is reachable from the start of each of its words, and
+every node caches its top-K entries by weight, so a completion is a walk of
+len(prefix) nodes plus a slice.
+
+Query popularity comes from the bounded trending sketch; only its top
+queries enter the trie, and the trie is rebuilt periodically instead of on
+every recorded search.
+"""
+
+import asyncio
+import time
+from typing import List, Dict, Any, Optional, Tuple
+from app.core.config import settings
+from app.services.search_index import topic_search_index
+from app.services.fuzzy import TrigramIndex
+from app.services.trending import trending_searches, normalize, query_key
+
+# Largest `limit` the suggestions endpoint accepts
+MAX_COMPLETIONS = 20
+
+PROGRAMMING_CONCEPTS = [
+    "loops", "functions", "variables", "arrays", "objects", "classes",
+    "inheritance", "polymorphism", "recursion", "algorithms", "data structures"
+]
+
+# Base weights per suggestion type; popularity is added on top
+TYPE_WEIGHTS = {"topic": 10, "language": 8, "concept": 5, "query": 0}
+
+# A search query becomes a suggestion of its own once it has been seen this often
+QUERY_MIN_COUNT = 2
+
+# Popular queries taken from the trending sketch on each rebuild
+POPULAR_QUERIES = 100
+
+EntryKey = Tuple[str, str]  # (type, normalized text)
+
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.top: List[EntryKey] = []
+
+
+class PrefixIndex:
+    """Trie with per-node top-K caches; weights may only grow"""
+
+    def __init__(self, max_k: int = MAX_COMPLETIONS):
+        self.max_k = max_k
+        self._root = _Node()
+        self._entries: Dict[EntryKey, Dict[str, Any]] = {}
+        self._weights: Dict[EntryKey, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: EntryKey) -> bool:
+        return key in self._entries
+
+    def keys(self):
+        return self._entries.keys()
+
+    def _paths(self, key: EntryKey):
+        """Node paths for every word-start suffix of the entry text"""
+        words = key[1].split(" ")
+        for i in range(len(words)):
+            node = self._root
+            path = [node]
+            for char in " ".join(words[i:]):
+                node = node.children.setdefault(char, _Node())
+                path.append(node)
+            yield path
+
+    def _promote(self, key: EntryKey):
+        weight = self._weights[key]
+        for path in self._paths(key):
+            for node in path[1:]:
+                if key in node.top:
+                    node.top.remove(key)
+                elif len(node.top) >= self.max_k and self._weights[node.top[-1]] >= weight:
+                    continue
+                position = len(node.top)
+                while position > 0 and self._weights[node.top[position - 1]] < weight:
+                    position -= 1
+                node.top.insert(position, key)
+                del node.top[self.max_k:]
+
+    def add(self, key: EntryKey, suggestion: Dict[str, Any], weight: float):
+        self._entries[key] = suggestion
+        self._weights[key] = max(weight, self._weights.get(key, weight))
+        self._promote(key)
+
+    def bump(self, key: EntryKey, delta: float = 1):
+        self._weights[key] += delta
+        self._promote(key)
+
+    def complete(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self._entries[key] for key in node.top[:limit]]
+
+
+class SearchSuggestions:
+    """Keeps a PrefixIndex in line with the topic catalog and query popularity"""
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.index = PrefixIndex()
+        self.vocabulary = TrigramIndex()
+        self._catalog_version: Optional[int] = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _rebuild(self):
+        index = PrefixIndex()
+        languages = {}
+        for topic in topic_search_index.topics.values():
+            index.add(("topic", normalize(topic["topicName"])), {
+                "suggestion": topic["topicName"],
+                "type": "topic",
+                "language": topic["language"],
+                "topicId": topic["id"]
+            }, TYPE_WEIGHTS["topic"])
+            languages.setdefault(normalize(topic["language"]), topic["language"])
+        for text, language in languages.items():
+            index.add(("language", text), {
+                "suggestion": language,
+                "type": "language",
+                "language": language
+            }, TYPE_WEIGHTS["language"])
+        for concept in PROGRAMMING_CONCEPTS:
+            index.add(("concept", normalize(concept)), {
+                "suggestion": concept.title(),
+                "type": "concept",
+                "language": "General"
+            }, TYPE_WEIGHTS["concept"])
+        vocabulary = TrigramIndex(word for _, text in index.keys() for word in text.split(" "))
+
+        # Credit popularity to a matching catalog entry, or index the query itself
+        for text, display, count in trending_searches.popular(POPULAR_QUERIES):
+            catalog_key = next(
+                ((kind, text) for kind in ("topic", "language", "concept") if (kind, text) in index), None
+            )
+            if catalog_key is not None:
+                index.bump(catalog_key, count)
+            elif count >= QUERY_MIN_COUNT:
+                for word in text.split(" "):
+                    vocabulary.add(word)
+                index.add(("query", text), {
+                    "suggestion": display,
+                    "type": "query",
+                    "language": "General"
+                }, TYPE_WEIGHTS["query"] + count)
+
+        self.index = index
+        self.vocabulary = vocabulary
+        self._catalog_version = topic_search_index.version
+        self._built_at = time.monotonic()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._catalog_version == topic_search_index.version
+            and time.monotonic() - self._built_at < self.refresh_seconds
+        )
+
+    async def ensure_fresh(self):
+        """Rebuild when the topic catalog has changed or the popular queries are due a refresh"""
+        await topic_search_index.ensure_fresh()
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if not self._is_fresh():
+                self._rebuild()
+
+    def suggest(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        text = query_key(query)
+        suggestions = self.index.complete(text, limit)
+        if len(suggestions) >= limit:
+            return suggestions
+
+        # Typo fallback: complete the spell-corrected query (or its last word)
+        words, edits = self.vocabulary.correct(text.split(" "))
+        if not edits:
+            return suggestions
+        seen = {id(suggestion) for suggestion in suggestions}
+        for prefix in (" ".join(words), words[-1]):
+            for suggestion in self.index.complete(prefix, limit):
+                if len(suggestions) < limit and id(suggestion) not in seen:
+                    seen.add(id(suggestion))
+                    suggestions.append({**suggestion, "corrected": True})
+        return suggestions
+
+# Global instance
+search_suggestions = SearchSuggestions(refresh_seconds=settings.SUGGESTIONS_REFRESH_SECONDS)
@@ -0,0 +1,190 @@
+"""
+Trending searches from a decayed Space-Saving sketch
+
+Each sketch tracks at most ``capacity`` queries. When a new query arrives
+while it is full, the smallest counter is reassigned to it (Space-Saving), so
+memory stays constant however many distinct queries are seen. Counts decay
+exponentially using forward decay: each hit is weighted by
+2^((t - landmark) / half_life), so old counts never need rewriting.
+
+Two sketches with short and long half-lives give the trend: a query whose
+share of recent searches is higher than its share over the long window is
+going up.
+"""
+
+import math
+import re
+import threading
+import time
+from typing import List, Dict, Any, Callable, Tuple
+from app.core.config import settings
+
+# Share ratio (short window vs long window) beyond which a query is trending up/down
+TREND_UP_RATIO = 1.25
+TREND_DOWN_RATIO = 0.8
+
+# Rescale forward-decay weights before they grow past 2^RESCALE_EXPONENT
+RESCALE_EXPONENT = 60
+
+# Recorded queries are cut to this many words/characters so one huge query
+# cannot bloat the sketch or the suggestion trie built from it
+MAX_QUERY_WORDS = 8
+MAX_QUERY_CHARS = 100
+
+
+def normalize(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9+#]+", text.lower()))
+
+
+def query_key(query: str) -> str:
+    """Normalized, length-capped form of a search query"""
+    words = normalize(query).split(" ")[:MAX_QUERY_WORDS]
+    return " ".join(words)[:MAX_QUERY_CHARS].strip()
+
+
+def display_text(query: str) -> str:
+    return " ".join(query.split()[:MAX_QUERY_WORDS])[:MAX_QUERY_CHARS]
+
+
+class DecayedSpaceSaving:
+    """Space-Saving heavy-hitters sketch with exponential time decay"""
+
+    def __init__(self, capacity: int, half_life: float, clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.half_life = half_life
+        self._clock = clock
+        self._landmark = clock()
+        self._counts: Dict[str, float] = {}
+        self._errors: Dict[str, float] = {}
+        self._total = 0.0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _weight(self, now: float) -> float:
+        exponent = (now - self._landmark) / self.half_life
+        if exponent > RESCALE_EXPONENT:
+            self._rescale(now)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _rescale(self, now: float):
+        factor = 2.0 ** (-(now - self._landmark) / self.half_life)
+        for key in self._counts:
+            self._counts[key] *= factor
+            self._errors[key] *= factor
+        self._total *= factor
+        self._landmark = now
+
+    def add(self, key: str):
+        weight = self._weight(self._clock())
+        self._total += weight
+        if key in self._counts:
+            self._counts[key] += weight
+            return
+        if len(self._counts) < self.capacity:
+            self._counts[key] = weight
+            self._errors[key] = 0.0
+            return
+        # Full: the smallest counter is taken over by the new key
+        victim = min(self._counts, key=self._counts.get)
+        floor = self._counts.pop(victim)
+        del self._errors[victim]
+        self._counts[key] = floor + weight
+        self._errors[key] = floor
+
+    def _scale(self) -> float:
+        """Divide stored weights by this to get counts decayed to now.
+
+        Rescales like add() does, so reads after a long idle spell cannot overflow.
+        """
+        return self._weight(self._clock())
+
+    def count(self, key: str) -> float:
+        scale = self._scale()
+        return self._counts.get(key, 0.0) / scale
+
+    def guaranteed(self, key: str) -> float:
+        """Lower bound on the count: what was added since the key took over a counter"""
+        scale = self._scale()
+        return (self._counts.get(key, 0.0) - self._errors.get(key, 0.0)) / scale
+
+    def total(self) -> float:
+        scale = self._scale()
+        return self._total / scale
+
+    def top(self, k: int) -> List[str]:
+        return sorted(self._counts, key=lambda key: (-self._counts[key], key))[:k]
+
+
+class TrendingSearches:
+    """Short and long decayed sketches over normalized search queries"""
+
+    def __init__(self, capacity: int, short_half_life: float, long_half_life: float):
+        self.short = DecayedSpaceSaving(capacity, short_half_life)
+        self.long = DecayedSpaceSaving(capacity, long_half_life)
+        # Display form of each tracked query, bounded by the long sketch's keys
+        self._display: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(self, query: str):
+        key = query_key(query)
+        if not key:
+            return
+        with self._lock:
+            self.short.add(key)
+            self.long.add(key)
+            self._display.setdefault(key, display_text(query))
+            if len(self._display) > 2 * self.long.capacity:
+                self._display = {k: v for k, v in self._display.items() if self.long.count(k) > 0}
+            self.recorded += 1
+
+    def _trend(self, key: str) -> str:
+        short_total, long_total = self.short.total(), self.long.total()
+        if short_total <= 0 or long_total <= 0:
+            return "stable"
+        short_share = self.short.count(key) / short_total
+        long_share = self.long.count(key) / long_total
+        ratio = short_share / long_share if long_share else math.inf
+        if ratio >= TREND_UP_RATIO:
+            return "up"
+        if ratio <= TREND_DOWN_RATIO:
+            return "down"
+        return "stable"
+
+    def top(self, k: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "query": self._display.get(key, key),
+                    "count": round(self.long.count(key)),
+                    "trend": self._trend(key)
+                }
+                for key in self.long.top(k)
+            ]
+
+    def popular(self, k: int) -> List[Tuple[str, str, float]]:
+        """(normalized query, display text, guaranteed decayed count) for the k most searched queries.
+
+        Uses the lower bound rather than the estimate, so a one-off query that
+        just took over an evicted counter does not look popular.
+        """
+        with self._lock:
+            return [(key, self._display.get(key, key), self.long.guaranteed(key)) for key in self.long.top(k)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "tracked": len(self.long),
+            "capacity": self.long.capacity,
+            "shortHalfLifeSeconds": self.short.half_life,
+            "longHalfLifeSeconds": self.long.half_life
+        }
+
+# Global instance
+trending_searches = TrendingSearches(
+    capacity=settings.TRENDING_CAPACITY,
+    short_half_life=settings.TRENDING_SHORT_HALF_LIFE_SECONDS,
+    long_half_life=settings.TRENDING_LONG_HALF_LIFE_SECONDS
+)
@@ -0,0 +1,172 @@
+"""
+Two-tier cache for YouTube responses plus a quota-unit ledger
+
+Entries live in an in-memory LRU in front of a SQLite file, so cached search
+results and video details survive restarts. SQLite work runs in a worker
+thread to keep the event loop free. Expired entries stay readable for
+``stale_seconds`` so callers can serve them while revalidating.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Data API quota cost per call, by endpoint
+QUOTA_COSTS = {"search": 100, "videos": 1}
+
+# Delete expired rows from disk once every this many writes
+PURGE_EVERY_WRITES = 500
+
+
+class VideoCache:
+    """In-memory LRU backed by an optional SQLite store (empty path disables disk)"""
+
+    def __init__(self, path: str, max_entries: int, stale_seconds: float = 0):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.stale_seconds = stale_seconds
+        self._memory: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+        self._writes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.disk_errors = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use so importing the service stays free of I/O
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS youtube_cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _disk_get(self, namespace: str, key: str) -> Optional[tuple]:
+        with self._disk_lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM youtube_cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, time.time() - self.stale_seconds)
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def _disk_put(self, namespace: str, key: str, value: Any, expires_at: float):
+        with self._disk_lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO youtube_cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), expires_at)
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY_WRITES == 0:
+                connection.execute(
+                    "DELETE FROM youtube_cache WHERE expires_at <= ?", (time.time() - self.stale_seconds,)
+                )
+            connection.commit()
+
+    def _remember(self, namespace: str, key: str, value: Any, expires_at: float):
+        self._memory[(namespace, key)] = (value, expires_at)
+        self._memory.move_to_end((namespace, key))
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def lookup(self, namespace: str, key: str) -> Optional[Tuple[Any, float]]:
+        """(value, expires_at) for a fresh or still-servable stale entry, else None"""
+        now = time.time()
+        entry = self._memory.get((namespace, key))
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at + self.stale_seconds > now:
+                self._memory.move_to_end((namespace, key))
+                self.memory_hits += 1
+                if expires_at <= now:
+                    self.stale_hits += 1
+                return entry
+            del self._memory[(namespace, key)]
+
+        if self.path:
+            try:
+                entry = await asyncio.to_thread(self._disk_get, namespace, key)
+            except Exception as e:
+                self.disk_errors += 1
+                logger.error(f"❌ YouTube cache read failed: {e}")
+                entry = None
+            if entry is not None:
+                self._remember(namespace, key, *entry)
+                self.disk_hits += 1
+                if entry[1] <= now:
+                    self.stale_hits += 1
+                return entry
+
+        self.misses += 1
+        return None
+
+    async def put(self, namespace: str, key: str, value: Any, ttl_seconds: float):
+        expires_at = time.time() + ttl_seconds
+        self._remember(namespace, key, value, expires_at)
+        if self.path:
+            try:
+                await asyncio.to_thread(self._disk_put, namespace, key, value, expires_at)
+            except Exception as e:
+                self.disk_errors += 1
+                logger.error(f"❌ YouTube cache write failed: {e}")
+
+    def close(self):
+        with self._disk_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memoryEntries": len(self._memory),
+            "maxMemoryEntries": self.max_entries,
+            "diskPath": self.path or None,
+            "memoryHits": self.memory_hits,
+            "diskHits": self.disk_hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "hitRate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "diskErrors": self.disk_errors
+        }
+
+
+class QuotaLedger:
+    """Running count of quota units spent on API calls and saved by cache hits"""
+
+    def __init__(self):
+        self.spent: Dict[str, int] = {}
+        self.saved = 0
+
+    def spend(self, endpoint: str):
+        self.spent[endpoint] = self.spent.get(endpoint, 0) + QUOTA_COSTS.get(endpoint, 1)
+
+    def save(self, units: int):
+        self.saved += units
+
+    def get_stats(self) -> Dict[str, Any]:
+        spent = sum(self.spent.values())
+        return {
+            "unitsSpent": spent,
+            "unitsSpentByEndpoint": dict(self.spent),
+            "unitsSaved": self.saved,
+            "savingsRate": round(self.saved / (spent + self.saved), 4) if spent + self.saved else 0.0
+        }
@@ -0,0 +1,166 @@
+"""
+Precomputed topic -> video index behind /api/videos/recommendations
+
+Each topic's ranked videos come from a YouTube search for its name and are
+stored through ``repositories.videos``. Recommendations only read the index
+and filter out what the user has watched, so serving them never calls
+YouTube. The index is rebuilt by the video pre-warmer after it refreshes the
+underlying searches, so rebuilding is served from the cache. Until the first
+build finishes, topics missing from the index are indexed on demand.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
+from app.repositories import repositories
+from app.services.youtube_service import (
+    youtube_service,
+    RECOMMENDATION_RESULTS_PER_TOPIC,
+    DEFAULT_RECOMMENDATION_TOPICS
+)
+
+logger = logging.getLogger(__name__)
+
+# Index entry for users with no indexed topics on their learning path
+GENERAL_TOPIC_ID = "general"
+GENERAL_LANGUAGE = "Programming"
+
+# In-progress/pending topics that recommendations draw on
+MAX_RECOMMENDATION_TOPICS = 3
+
+
+def interleave(lists: List[List[Dict[str, Any]]], skip: Set[str], limit: int) -> List[Dict[str, Any]]:
+    """Round-robin over ranked lists, dropping duplicates and skipped youtubeIds"""
+    seen = set(skip)
+    merged = []
+    for position in range(max((len(videos) for videos in lists), default=0)):
+        for videos in lists:
+            if position < len(videos) and videos[position]["youtubeId"] not in seen:
+                seen.add(videos[position]["youtubeId"])
+                merged.append(videos[position])
+                if len(merged) == limit:
+                    return merged
+    return merged
+
+
+class TopicVideoIndex:
+    """Builds and reads the per-topic ranked video lists"""
+
+    def __init__(self):
+        self.builds = 0
+        self.topics_indexed = 0
+        self.videos_indexed = 0
+        self.failed = 0
+        self.last_built_at: Optional[float] = None
+        self.on_demand = 0
+        self._write_lock = asyncio.Lock()
+
+    async def _fetch_topic(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Merged ranking of the topic's searches"""
+        results = await asyncio.gather(*(
+            youtube_service.search_videos(query, max_results=RECOMMENDATION_RESULTS_PER_TOPIC)
+            for query in queries
+        ))
+        return interleave(list(results), set(), len(queries) * RECOMMENDATION_RESULTS_PER_TOPIC)
+
+    async def _store_topic(self, topic_id: str, language: str, videos: List[Dict[str, Any]]) -> int:
+        # A video belongs to one topic, so writes go one topic at a time
+        async with self._write_lock:
+            return await repositories.videos.replace_topic(topic_id, language, videos)
+
+    async def index_topic(self, topic_id: str, language: str, queries: List[str]) -> int:
+        """Search each query and store the merged ranking; an empty result keeps the previous list"""
+        videos = await self._fetch_topic(queries)
+        if not videos:
+            return 0
+        return await self._store_topic(topic_id, language, videos)
+
+    async def rebuild(self, topics: Optional[List[Dict[str, Any]]] = None):
+        if topics is None:
+            topics = await repositories.topics.list_all()
+        targets: List[Tuple[str, str, List[str]]] = [
+            (topic["id"], topic["language"], [topic["topicName"]])
+            for topic in topics
+            if topic.get("topicName") and topic.get("language")
+        ]
+        targets.append((GENERAL_TOPIC_ID, GENERAL_LANGUAGE, DEFAULT_RECOMMENDATION_TOPICS))
+
+        # Searches run concurrently; writes are applied in catalog order
+        fetched = await asyncio.gather(
+            *(self._fetch_topic(queries) for _, _, queries in targets), return_exceptions=True
+        )
+        topics_indexed = videos_indexed = 0
+        for (topic_id, language, _), videos in zip(targets, fetched):
+            if isinstance(videos, Exception):
+                self.failed += 1
+                logger.error(f"❌ Failed to index videos for topic {topic_id}: {videos}")
+                continue
+            try:
+                stored = await self._store_topic(topic_id, language, videos) if videos else 0
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"❌ Failed to index videos for topic {topic_id}: {e}")
+                continue
+            if stored:
+                topics_indexed += 1
+                videos_indexed += stored
+        # Counts from the latest build
+        self.topics_indexed = topics_indexed
+        self.videos_indexed = videos_indexed
+        self.builds += 1
+        self.last_built_at = time.time()
+
+    async def recommend(
+        self, topic_ids: List[str], watched: Set[str], limit: int
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Unwatched videos for the user's topics (or the general list) and the names they are based on"""
+        topics = [
+            topic for topic in await asyncio.gather(
+                *(repositories.topics.get_by_id(topic_id) for topic_id in topic_ids[:MAX_RECOMMENDATION_TOPICS])
+            )
+            if topic and topic.get("language")
+        ]
+        indexed = await repositories.videos.get_topics([(topic["language"], topic["id"]) for topic in topics])
+        indexed.update(await self._index_missing([
+            (topic["id"], topic["language"], [topic["topicName"]])
+            for topic in topics
+            if not indexed.get(topic["id"]) and topic.get("topicName")
+        ]))
+        based_on = [topic.get("topicName", topic["id"]) for topic in topics if indexed.get(topic["id"])]
+        lists = [indexed[topic["id"]] for topic in topics if indexed.get(topic["id"])]
+
+        if not lists:
+            general = await repositories.videos.get_topics([(GENERAL_LANGUAGE, GENERAL_TOPIC_ID)])
+            if not general:
+                general = await self._index_missing([(GENERAL_TOPIC_ID, GENERAL_LANGUAGE, DEFAULT_RECOMMENDATION_TOPICS)])
+            based_on = list(DEFAULT_RECOMMENDATION_TOPICS)
+            lists = [general.get(GENERAL_TOPIC_ID, [])]
+
+        return interleave(lists, watched, limit), based_on
+
+    async def _index_missing(self, targets: List[Tuple[str, str, List[str]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Index (topic_id, language, queries) on demand until the first build has finished (cold start)"""
+        if not targets or self.builds or not youtube_service.configured:
+            return {}
+        self.on_demand += len(targets)
+        for target in targets:
+            try:
+                await self.index_topic(*target)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"❌ Failed to index videos for topic {target[0]}: {e}")
+        return await repositories.videos.get_topics([(language, topic_id) for topic_id, language, _ in targets])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "builds": self.builds,
+            "topicsIndexed": self.topics_indexed,
+            "videosIndexed": self.videos_indexed,
+            "failed": self.failed,
+            "onDemand": self.on_demand,
+            "lastBuiltAt": self.last_built_at
+        }
+
+# Global instance
+topic_video_index = TopicVideoIndex()
@@ -0,0 +1,123 @@
+"""
+Background refresh of the YouTube searches behind trending and recommendations
+
+Every ``interval`` seconds the pre-warmer re-fetches each trending query and
+each topic's recommendation search whose cache entry is missing or expires
+within ``refresh_ahead`` seconds, then rebuilds the topic -> video index from
+those now-cached searches. Request handlers find trending searches in the
+cache, and anything that does lapse is served stale while revalidating.
+With ``interval <= 0`` only the startup pass runs, which still builds the
+topic -> video index.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from app.core.config import settings
+from app.repositories import repositories
+from app.services.video_index import topic_video_index
+from app.services.youtube_service import (
+    youtube_service,
+    trending_queries,
+    TRENDING_RESULTS_PER_QUERY,
+    RECOMMENDATION_RESULTS_PER_TOPIC,
+    DEFAULT_RECOMMENDATION_TOPICS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class VideoPrewarmer:
+    """Periodic refresh-ahead of the searches the video routes issue"""
+
+    def __init__(self, interval: float, refresh_ahead: float):
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.refreshed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.last_run_at: Optional[float] = None
+        self.last_run_ms: Optional[float] = None
+
+    @staticmethod
+    def _targets(topics: List[Dict[str, Any]]) -> List[Tuple[str, int]]:
+        """(query, max_results) for every trending and topic-index search"""
+        targets: Dict[str, int] = {}
+        for language in sorted({topic["language"] for topic in topics if topic.get("language")}):
+            for query in trending_queries(language):
+                targets[query] = TRENDING_RESULTS_PER_QUERY
+        for query in [topic["topicName"] for topic in topics if topic.get("topicName")] + DEFAULT_RECOMMENDATION_TOPICS:
+            targets.setdefault(query, RECOMMENDATION_RESULTS_PER_TOPIC)
+        return list(targets.items())
+
+    async def _refresh(self, query: str, max_results: int):
+        # Shares the fan-out slots so warming never crowds out request traffic
+        try:
+            fetched = await youtube_service.refresh_search_bounded(
+                query, max_results=max_results, ahead_seconds=self.refresh_ahead
+            )
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"❌ Pre-warm failed for '{query}': {e}")
+            return
+        if fetched:
+            self.refreshed += 1
+        else:
+            self.skipped += 1
+
+    async def warm_once(self):
+        start = time.perf_counter()
+        topics = await repositories.topics.list_all()
+        await asyncio.gather(*(self._refresh(query, max_results) for query, max_results in self._targets(topics)))
+        await topic_video_index.rebuild(topics)
+        self.runs += 1
+        self.last_run_at = time.time()
+        self.last_run_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.warm_once()
+            except Exception as e:
+                logger.error(f"❌ YouTube pre-warm pass failed: {e}")
+            if self.interval <= 0:
+                return
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the refresh loop (a single pass when disabled, no-op without an API key)"""
+        if not youtube_service.configured:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.interval > 0 and self._task is not None and not self._task.done(),
+            "intervalSeconds": self.interval,
+            "refreshAheadSeconds": self.refresh_ahead,
+            "runs": self.runs,
+            "refreshed": self.refreshed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "lastRunAt": self.last_run_at,
+            "lastRunMs": self.last_run_ms
+        }
+
+# Global instance
+video_prewarmer = VideoPrewarmer(
+    interval=settings.YOUTUBE_PREWARM_INTERVAL_SECONDS,
+    refresh_ahead=settings.YOUTUBE_PREWARM_REFRESH_AHEAD_SECONDS
+)
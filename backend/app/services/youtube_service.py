@@ -1,19 +1,261 @@
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from typing import List, Dict, Any, Optional
+import asyncio
+import httpx
+import time
+from collections import deque
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple, Set
 import logging
 from app.core.config import settings
+from app.services.video_cache import VideoCache, QuotaLedger, QUOTA_COSTS
 
 logger = logging.getLogger(__name__)
 
+# videos.list accepts up to 50 ids per call for the same quota cost
+VIDEOS_LIST_MAX_IDS = 50
+VIDEO_PARTS = "snippet,contentDetails,statistics"
+
+# Searches behind /trending/{language} and the recommendation index; the pre-warmer
+# refreshes exactly these so request-path lookups hit the cache
+TRENDING_QUERY_TEMPLATES = ["{language} tutorial 2026", "{language} advanced concepts"]
+TRENDING_RESULTS_PER_QUERY = 5
+# Depth of each topic's list in the recommendation index (search costs the same at any size)
+RECOMMENDATION_RESULTS_PER_TOPIC = 10
+DEFAULT_RECOMMENDATION_TOPICS = ["Programming fundamentals", "Code tutorial beginner"]
+
+def trending_queries(language: str) -> List[str]:
+    return [template.format(language=language) for template in TRENDING_QUERY_TEMPLATES]
+
+class YouTubeAPIError(Exception):
+    """Non-success response from the YouTube Data API"""
+    
+    def __init__(self, endpoint: str, status_code: int, detail: str):
+        super().__init__(f"{endpoint} returned {status_code}: {detail}")
+        self.status_code = status_code
+
 class YouTubeService:
     def __init__(self):
         self.api_key = settings.YOUTUBE_API_KEY
-        self.youtube = build(
-            settings.YOUTUBE_API_SERVICE_NAME, 
-            settings.YOUTUBE_API_VERSION, 
-            developerKey=self.api_key
+        self.base_url = settings.YOUTUBE_API_BASE_URL.rstrip("/")
+        # Created on first use, so importing the service does no I/O and works offline
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Per-endpoint call metrics; recent latencies feed the percentiles
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+        self.cache = VideoCache(
+            settings.YOUTUBE_CACHE_PATH,
+            settings.YOUTUBE_CACHE_MEMORY_ENTRIES,
+            stale_seconds=settings.YOUTUBE_STALE_SECONDS
         )
+        self.quota = QuotaLedger()
+        # In-flight fetches by (namespace, key), shared by concurrent identical callers
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.flights = {"leaders": 0, "joined": 0, "revalidations": 0}
+        # Caps concurrent searches across all fan-outs
+        self._fanout_slots = asyncio.Semaphore(settings.YOUTUBE_FANOUT_CONCURRENCY)
+        self.fanout = {"fanOuts": 0, "queries": 0, "timedOut": 0}
+        # videos.list ids waiting for the next batch, with their callers' futures
+        self._batch_waiters: Dict[str, List[asyncio.Future]] = {}
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+        # Strong references to in-flight batch calls (the loop only keeps weak ones)
+        self._batch_sends: Set[asyncio.Task] = set()
+        self.batches = {"calls": 0, "ids": 0, "lookups": 0}
+    
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """The pooled client for the running event loop; keep-alive connections are reused"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=settings.YOUTUBE_HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.YOUTUBE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.YOUTUBE_MAX_CONNECTIONS
+                )
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def _call(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET a Data API v3 endpoint and record its latency"""
+        if not self.configured:
+            raise YouTubeAPIError(endpoint, 0, "YOUTUBE_API_KEY is not configured")
+        
+        metrics = self.metrics.setdefault(endpoint, {
+            "calls": 0, "errors": 0, "totalMs": 0.0, "maxMs": 0.0, "recentMs": deque(maxlen=200)
+        })
+        started = time.perf_counter()
+        try:
+            response = await self._get_client().get(
+                f"{self.base_url}/{endpoint}",
+                params={**params, "key": self.api_key}
+            )
+            self.quota.spend(endpoint)
+            if response.status_code != 200:
+                raise YouTubeAPIError(endpoint, response.status_code, response.text[:200])
+            return response.json()
+        except Exception:
+            metrics["errors"] += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            metrics["calls"] += 1
+            metrics["totalMs"] += elapsed
+            metrics["maxMs"] = max(metrics["maxMs"], elapsed)
+            metrics["recentMs"].append(elapsed)
+    
+    async def _single_flight(self, namespace: str, key: str, fetch: Callable[[], Awaitable[Any]], units: int) -> Any:
+        """Run fetch once for concurrent callers with the same key; joiners share its result.
+
+        The shared fetch is shielded, so a caller that times out or disconnects
+        does not cancel it for the others.
+        """
+        flight_key = (namespace, key)
+        flight = self._inflight.get(flight_key)
+        if flight is not None:
+            self.flights["joined"] += 1
+            self.quota.save(units)
+            return await asyncio.shield(flight)
+        
+        return await asyncio.shield(self._start_flight(flight_key, fetch))
+    
+    def _start_flight(self, flight_key: Tuple[str, str], fetch: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        flight = asyncio.ensure_future(fetch())
+        self._inflight[flight_key] = flight
+        flight.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+        self.flights["leaders"] += 1
+        return flight
+    
+    async def search_many(
+        self,
+        queries: List[str],
+        max_results: int = 5,
+        duration: str = "medium",
+        timeout: float = 10.0
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        """Run several searches concurrently under one shared deadline.
+
+        Returns one entry per query, in order; queries still running at the
+        deadline come back as None so callers can use the partial results.
+        Their underlying fetches keep running and still fill the cache.
+        """
+        async def bounded(query: str):
+            async with self._fanout_slots:
+                return await self.search_videos(query, max_results=max_results, duration=duration)
+        
+        tasks = [asyncio.ensure_future(bounded(query)) for query in queries]
+        if not tasks:
+            return []
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        
+        self.fanout["fanOuts"] += 1
+        self.fanout["queries"] += len(tasks)
+        self.fanout["timedOut"] += len(pending)
+        return [
+            task.result() if task in done and task.exception() is None else None
+            for task in tasks
+        ]
+    
+    def _enqueue_video(self, video_id: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch_waiters.setdefault(video_id, []).append(future)
+        self.batches["lookups"] += 1
+        if len(self._batch_waiters) >= VIDEOS_LIST_MAX_IDS:
+            self._dispatch_batches()
+        elif self._batch_timer is None:
+            self._batch_timer = loop.call_later(settings.YOUTUBE_BATCH_WINDOW_MS / 1000, self._dispatch_batches)
+        return future
+    
+    def _dispatch_batches(self):
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        waiters, self._batch_waiters = self._batch_waiters, {}
+        video_ids = list(waiters)
+        for start in range(0, len(video_ids), VIDEOS_LIST_MAX_IDS):
+            chunk = video_ids[start:start + VIDEOS_LIST_MAX_IDS]
+            send = asyncio.ensure_future(self._send_batch({video_id: waiters[video_id] for video_id in chunk}))
+            self._batch_sends.add(send)
+            send.add_done_callback(self._batch_sends.discard)
+    
+    async def _send_batch(self, waiters: Dict[str, List[asyncio.Future]]):
+        """One videos.list call for a batch of ids; results fan back out to each caller"""
+        self.batches["calls"] += 1
+        self.batches["ids"] += len(waiters)
+        try:
+            response = await self._call("videos", {"part": VIDEO_PARTS, "id": ",".join(waiters)})
+            items = {item["id"]: item for item in response.get("items", [])}
+            for video_id, futures in waiters.items():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(items.get(video_id))
+        except Exception as e:
+            for futures in waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    async def _get_video_items(self, video_ids: List[str]) -> List[Dict[str, Any]]:
+        """Raw videos.list items for the given ids (missing videos are skipped).
+
+        Lookups arriving within YOUTUBE_BATCH_WINDOW_MS of each other, from any
+        request, are merged into a single multi-id call.
+        """
+        results = await asyncio.gather(*(self._enqueue_video(video_id) for video_id in video_ids), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return [item for item in results if item is not None]
+    
+    def get_batch_stats(self) -> Dict[str, Any]:
+        calls = self.batches["calls"]
+        return {**self.batches, "avgBatchSize": round(self.batches["ids"] / calls, 2) if calls else 0.0}
+    
+    def _revalidate(self, namespace: str, key: str, fetch: Callable[[], Awaitable[Any]]):
+        """Refresh a stale entry in the background (no-op if a fetch is already running)"""
+        if (namespace, key) in self._inflight:
+            return
+        self.flights["revalidations"] += 1
+        flight = self._start_flight((namespace, key), fetch)
+        
+        def report(done: asyncio.Future):
+            # Nobody awaits a background refresh, so surface its failure here
+            if not done.cancelled() and done.exception() is not None:
+                logger.error(f"❌ Background refresh of {namespace} '{key}' failed: {done.exception()}")
+        
+        flight.add_done_callback(report)
+    
+    def get_flight_stats(self) -> Dict[str, Any]:
+        return {**self.flights, "inFlight": len(self._inflight)}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-endpoint call counts, errors and latency (ms)"""
+        stats = {}
+        for endpoint, metrics in self.metrics.items():
+            recent = sorted(metrics["recentMs"])
+            stats[endpoint] = {
+                "calls": metrics["calls"],
+                "errors": metrics["errors"],
+                "avgMs": round(metrics["totalMs"] / metrics["calls"], 2) if metrics["calls"] else 0.0,
+                "p50Ms": round(recent[len(recent) // 2], 2) if recent else 0.0,
+                "p95Ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 2) if recent else 0.0,
+                "maxMs": round(metrics["maxMs"], 2)
+            }
+        return stats
+    
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.cache.close()
+    
+    @staticmethod
+    def _search_key(query: str, max_results: int, duration: str, language: str) -> str:
+        return "|".join([" ".join(query.lower().split()), str(max_results), duration, language])
     
     async def search_videos(
         self, 
@@ -22,7 +264,68 @@ class YouTubeService:
         duration: str = "medium",
         language: str = "en"
     ) -> List[Dict[str, Any]]:
-        """Search for educational videos on YouTube"""
+        """Search for educational videos on YouTube (cached per normalized query).
+
+        Stale cache entries are served immediately and refreshed in the background.
+        """
+        key = self._search_key(query, max_results, duration, language)
+        fetch = self._search_fetch(key, query, max_results, duration, language)
+        units = QUOTA_COSTS["search"] + QUOTA_COSTS["videos"]
+        
+        cached = await self.cache.lookup("search", key)
+        if cached is not None:
+            videos, expires_at = cached
+            self.quota.save(units)
+            if expires_at <= time.time():
+                self._revalidate("search", key, fetch)
+            return list(videos)
+        
+        return list(await self._single_flight("search", key, fetch, units))
+    
+    def _search_fetch(self, key: str, query: str, max_results: int, duration: str, language: str):
+        async def fetch():
+            videos = await self._search_videos(query, max_results, duration, language)
+            # Failed or empty searches are not cached so they are retried next time
+            if videos:
+                await self.cache.put("search", key, videos, settings.YOUTUBE_SEARCH_TTL_SECONDS)
+            return videos
+        return fetch
+    
+    async def refresh_search_bounded(
+        self,
+        query: str,
+        max_results: int = 10,
+        duration: str = "medium",
+        language: str = "en",
+        ahead_seconds: float = 0
+    ) -> bool:
+        """refresh_search under the fan-out concurrency limit shared with request traffic"""
+        async with self._fanout_slots:
+            return await self.refresh_search(query, max_results, duration, language, ahead_seconds)
+    
+    async def refresh_search(
+        self,
+        query: str,
+        max_results: int = 10,
+        duration: str = "medium",
+        language: str = "en",
+        ahead_seconds: float = 0
+    ) -> bool:
+        """Re-fetch a search if it is missing or expires within ahead_seconds; returns whether it fetched"""
+        key = self._search_key(query, max_results, duration, language)
+        cached = await self.cache.lookup("search", key)
+        if cached is not None and cached[1] - time.time() > ahead_seconds:
+            return False
+        await self._single_flight("search", key, self._search_fetch(key, query, max_results, duration, language), 0)
+        return True
+    
+    async def _search_videos(
+        self,
+        query: str,
+        max_results: int,
+        duration: str,
+        language: str
+    ) -> List[Dict[str, Any]]:
         try:
             # Enhanced search query for educational content
             enhanced_query = f"{query} tutorial programming learn code explanation"
@@ -34,31 +337,26 @@ class YouTubeService:
                 "long": "long"       # > 20 minutes
             }.get(duration, "medium")
             
-            search_response = self.youtube.search().list(
-                q=enhanced_query,
-                part="id,snippet",
-                maxResults=max_results,
-                type="video",
-                videoDuration=duration_filter,
-                videoEmbeddable="true",
-                videoSyndicated="true",
-                relevanceLanguage=language,
-                safeSearch="strict",
-                order="relevance"
-            ).execute()
+            search_response = await self._call("search", {
+                "q": enhanced_query,
+                "part": "id,snippet",
+                "maxResults": max_results,
+                "type": "video",
+                "videoDuration": duration_filter,
+                "videoEmbeddable": "true",
+                "videoSyndicated": "true",
+                "relevanceLanguage": language,
+                "safeSearch": "strict",
+                "order": "relevance"
+            })
             
             video_ids = []
             for item in search_response["items"]:
                 video_ids.append(item["id"]["videoId"])
             
             # Get video details including duration
-            videos_response = self.youtube.videos().list(
-                part="contentDetails,statistics,snippet",
-                id=",".join(video_ids)
-            ).execute()
-            
             videos = []
-            for item in videos_response["items"]:
+            for item in await self._get_video_items(video_ids):
                 video_data = {
                     "id": f"yt_{item['id']}",
                     "title": item["snippet"]["title"],
@@ -78,7 +376,7 @@ class YouTubeService:
             videos.sort(key=lambda x: x["relevanceScore"], reverse=True)
             return videos
             
-        except HttpError as e:
+        except (YouTubeAPIError, httpx.HTTPError) as e:
             logger.error(f"YouTube API error: {e}")
             return []
         except Exception as e:
@@ -86,17 +384,31 @@ class YouTubeService:
             return []
     
     async def get_video_details(self, video_id: str) -> Optional[Dict[str, Any]]:
-        """Get detailed information about a specific video"""
+        """Get detailed information about a specific video (cached per video id, served stale-while-revalidate)"""
+        async def fetch():
+            details = await self._get_video_details(video_id)
+            if details is not None:
+                await self.cache.put("details", video_id, details, settings.YOUTUBE_DETAILS_TTL_SECONDS)
+            return details
+        
+        cached = await self.cache.lookup("details", video_id)
+        if cached is not None:
+            details, expires_at = cached
+            self.quota.save(QUOTA_COSTS["videos"])
+            if expires_at <= time.time():
+                self._revalidate("details", video_id, fetch)
+            return details
+        
+        return await self._single_flight("details", video_id, fetch, QUOTA_COSTS["videos"])
+    
+    async def _get_video_details(self, video_id: str) -> Optional[Dict[str, Any]]:
         try:
-            response = self.youtube.videos().list(
-                part="snippet,contentDetails,statistics",
-                id=video_id
-            ).execute()
+            items = await self._get_video_items([video_id])
             
-            if not response["items"]:
+            if not items:
                 return None
                 
-            item = response["items"][0]
+            item = items[0]
             return {
                 "id": f"yt_{item['id']}",
                 "title": item["snippet"]["title"],
@@ -110,7 +422,7 @@ class YouTubeService:
                 "publishedAt": item["snippet"]["publishedAt"]
             }
             
-        except HttpError as e:
+        except (YouTubeAPIError, httpx.HTTPError) as e:
             logger.error(f"YouTube API error getting video details: {e}")
             return None
     
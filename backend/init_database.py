@@ -50,6 +50,38 @@ async def create_indexes():
         await db[Collections.VIDEOS].create_index([("language", 1), ("topic", 1)])
         logger.info("✅ Created indexes for videos collection")
         
+        # Leaderboard collection indexes
+        await db[Collections.LEADERBOARD].create_index("user_id", unique=True)
+        await db[Collections.LEADERBOARD].create_index("total_score")
+        await db[Collections.LEADERBOARD].create_index([("total_score", -1), ("user_id", 1)])
+        logger.info("✅ Created indexes for leaderboard collection")
+        
+        # Per-language leaderboards, one document per (language, user)
+        await db[Collections.LEADERBOARD_LANGUAGES].create_index(
+            [("language", 1), ("user_id", 1)], unique=True
+        )
+        await db[Collections.LEADERBOARD_LANGUAGES].create_index(
+            [("language", 1), ("score", -1), ("user_id", 1)]
+        )
+        logger.info("✅ Created indexes for leaderboard_languages collection")
+        
+        # Time-windowed leaderboard buckets; expired buckets are removed by the TTL index
+        await db[Collections.LEADERBOARD_WINDOWS].create_index(
+            [("period", 1), ("bucket", 1), ("user_id", 1)], unique=True
+        )
+        await db[Collections.LEADERBOARD_WINDOWS].create_index(
+            [("period", 1), ("bucket", 1), ("score", -1), ("user_id", 1)]
+        )
+        await db[Collections.LEADERBOARD_WINDOWS].create_index("expires_at", expireAfterSeconds=0)
+        logger.info("✅ Created indexes for leaderboard_windows collection")
+        
+        # Search history collection indexes
+        await db[Collections.SEARCH_HISTORY].create_index([("user_id", 1), ("timestamp", -1)])
+        await db[Collections.SEARCH_HISTORY].create_index(
+            "timestamp", expireAfterSeconds=Settings.SEARCH_HISTORY_RETENTION_DAYS * 86400
+        )
+        logger.info("✅ Created indexes for search_history collection")
+        
         return True
         
     except Exception as e:
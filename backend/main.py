@@ -4,19 +4,28 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
+import time
 import uvicorn
 from app.models import *
 from app.data import get_mock_data, initialize_data
+
+# Startup phase timings in milliseconds, reported on startup and via /health
+startup_timings: Dict[str, float] = {}
+
+_phase_start = time.perf_counter()
 from app.routes import auth, users, topics, quiz, videos, leaderboard, analytics, search
 from app.routes import database as db_routes
+startup_timings["routerImport"] = round((time.perf_counter() - _phase_start) * 1000, 2)
+
 from app.core.config import Settings
 from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.auth import password_hasher
+from app.services.youtube_service import youtube_service
+from app.services.video_prewarmer import video_prewarmer
+from app.repositories import configure_repositories, repositories
 
 settings = Settings()
 
-# Initialize data with proper password hashing
-initialize_data()
-
 app = FastAPI(
     title="Pixel Pirates API",
     description="Educational platform API for Pixel Pirates with AI-powered learning and YouTube integration",
@@ -39,23 +48,39 @@ async def startup_event():
     print("🚀 Starting Pixel Pirates API...")
     
     # Initialize mock data (temporary until full migration)
+    phase_start = time.perf_counter()
     initialize_data()
+    startup_timings["dataInit"] = round((time.perf_counter() - phase_start) * 1000, 2)
     
     # Connect to MongoDB
     print("📦 Connecting to MongoDB...")
+    phase_start = time.perf_counter()
     connection_success = await connect_to_mongo(settings)
+    startup_timings["mongoConnect"] = round((time.perf_counter() - phase_start) * 1000, 2)
     
     if connection_success:
         print("✅ MongoDB connected successfully!")
     else:
         print("⚠️  MongoDB connection failed - continuing with mock data")
+    
+    backends = configure_repositories(settings, connection_success)
+    print("🗂️  Repository backends: " + ", ".join(f"{name}={backend}" for name, backend in backends.items()))
+    
+    video_prewarmer.start()
+    
+    print("⏱️  Startup timings: " + ", ".join(f"{phase}={ms}ms" for phase, ms in startup_timings.items()))
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up database connection on shutdown"""
     print("🔄 Shutting down Pixel Pirates API...")
+    # Stop background work that writes through the repositories before closing Mongo
+    await video_prewarmer.stop()
+    await youtube_service.close()
+    await repositories.search_history.flush()
     await close_mongo_connection()
     print("✅ Database connection closed")
+    password_hasher.shutdown()
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -113,13 +138,19 @@ async def api_info():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
+    """Health check endpoint (503 while a mongo-configured collection runs on the mock fallback)"""
+    body = {
+        "status": "degraded" if repositories.degraded else "healthy",
         "timestamp": datetime.now().isoformat(),
         "version": "2.0.0",
-        "environment": "development" if settings.API_BASE_URL.startswith("http://localhost") else "production"
+        "environment": "development" if settings.API_BASE_URL.startswith("http://localhost") else "production",
+        "startupTimings": startup_timings
     }
+    if repositories.degraded:
+        # This worker's data would diverge from the others; take it out of rotation
+        body["degradedCollections"] = list(repositories.degraded)
+        return JSONResponse(status_code=503, content=body)
+    return body
 
 if __name__ == "__main__":
     # Validate settings before starting
@@ -85,6 +85,7 @@ get("/health")
 print("\n[2] DATABASE ENDPOINTS")
 get("/api/database/health")
 get("/api/database/test-connection")
+get("/api/database/pool-stats")
 
 # ──── AUTH: SIGNUP ────
 print("\n[3] AUTH ENDPOINTS")
@@ -102,6 +103,13 @@ else:
     # user might already exist, try login
     print("       -> Signup may have returned conflict, trying login...")
 
+# ──── AUTH: SIGNUP (duplicate email) ────
+post("/api/auth/signup", {
+    "name": "Test User",
+    "email": rand_email.upper(),
+    "password": "testpass123"
+}, expect=409)
+
 # ──── AUTH: LOGIN ────
 r, body = post("/api/auth/login", {
     "email": "alex@edutwin.com",
@@ -125,6 +133,10 @@ get("/api/auth/me", headers=auth_header())
 # ──── AUTH: REFRESH ────
 post("/api/auth/refresh", headers=auth_header())
 
+# ──── AUTH: CACHE / HASHER STATS ────
+get("/api/auth/token-cache-stats")
+get("/api/auth/hasher-stats")
+
 # ──── AUTH: LOGOUT ────
 post("/api/auth/logout", headers=auth_header())
 
@@ -200,6 +212,7 @@ post("/api/videos/watch", {
 
 # Trending videos
 get("/api/videos/trending/Python")
+get("/api/videos/api-stats")
 
 # ──── LEADERBOARD ────
 print("\n[8] LEADERBOARD ENDPOINTS")
@@ -207,6 +220,16 @@ get("/api/leaderboard", headers=auth_header())
 get("/api/leaderboard/top/5")
 get("/api/leaderboard/user-rank", headers=auth_header())
 get("/api/leaderboard/language/Python")
+r, body = get("/api/leaderboard", headers=auth_header(), params={"limit": 2})
+next_cursor = body.get("data", {}).get("pagination", {}).get("nextCursor")
+if next_cursor:
+    get("/api/leaderboard", headers=auth_header(), params={"limit": 2, "cursor": next_cursor})
+get("/api/leaderboard", headers=auth_header(), params={"cursor": "not-a-cursor"}, expect=400)
+get("/api/leaderboard/window/daily", headers=auth_header())
+get("/api/leaderboard/window/weekly", headers=auth_header(), params={"previous": "true"})
+get("/api/leaderboard/window/monthly", headers=auth_header())
+get("/api/leaderboard/window/yearly", headers=auth_header(), expect=400)
+get("/api/leaderboard/stream/stats")
 
 # ──── ANALYTICS ────
 print("\n[9] ANALYTICS ENDPOINTS")
@@ -221,6 +244,9 @@ get("/api/search/suggestions?q=python")
 get("/api/search/global?q=python")
 get("/api/search/global?q=loops&category=topics")
 get("/api/search/trending")
+get("/api/search/trending?limit=3")
+get("/api/search/global?q=pyhton")
+get("/api/search/cache-stats")
 get("/api/search/recent", headers=auth_header())
 post("/api/search", {"query": "python loops test"}, headers=auth_header())
 delete("/api/search/recent", headers=auth_header())
@@ -0,0 +1,45 @@
+"""
+Cut-off OSA edit distance and trigram corrections
+"""
+
+import random
+from app.services.fuzzy import edit_distance, TrigramIndex
+
+
+def osa_distance(a, b):
+    """Full-table optimal string alignment distance"""
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+def test_edit_distance_matches_full_table_with_cutoff():
+    rng = random.Random(14)
+    for _ in range(3000):
+        a = "".join(rng.choices("abcd", k=rng.randint(0, 7)))
+        b = "".join(rng.choices("abcd", k=rng.randint(0, 7)))
+        limit = rng.randint(0, 3)
+        expected = osa_distance(a, b)
+        assert edit_distance(a, b, limit) == (expected if expected <= limit else None)
+
+
+def test_transposition_is_one_edit():
+    assert edit_distance("pyhton", "python", 1) == 1
+    assert edit_distance("recursoin", "recursion", 2) == 1
+
+
+def test_corrections_pick_closest_vocabulary_words():
+    index = TrigramIndex(["python", "pytorch", "java", "javascript", "recursion"])
+    assert index.corrections("pyhton")[0] == ("python", 1)
+    assert index.corrections("python") == []
+    assert index.corrections("zzzzzz") == []
+    assert index.correct(["pyhton", "recursoin"]) == (["python", "recursion"], 2)
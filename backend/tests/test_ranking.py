@@ -0,0 +1,49 @@
+"""
+Randomized checks of the indexable skiplist against a plain sorted list
+"""
+
+import bisect
+import random
+from app.data.ranking import RankedIndex, Leaderboard, rank_key
+
+
+def test_ranked_index_matches_sorted_list():
+    rng = random.Random(7)
+    index = RankedIndex()
+    expected = []
+
+    for _ in range(5000):
+        key = rank_key(rng.randint(0, 50), f"user-{rng.randint(0, 400)}")
+        if key in expected and rng.random() < 0.5:
+            index.remove(key)
+            expected.remove(key)
+        elif key not in expected:
+            index.insert(key)
+            bisect.insort(expected, key)
+
+        assert len(index) == len(expected)
+        probe = rank_key(rng.randint(-1, 51), f"user-{rng.randint(0, 400)}")
+        assert index.count_before(probe) == bisect.bisect_left(expected, probe)
+
+        count = rng.randint(0, 15)
+        position, keys = index.slice_after(probe, count)
+        after = bisect.bisect_right(expected, probe)
+        assert position == after
+        assert keys == expected[after:after + count]
+
+        start = rng.randint(0, len(expected))
+        assert index.slice(start, count) == expected[start:start + count]
+
+
+def test_leaderboard_ranks_by_score_then_user_id():
+    board = Leaderboard()
+    board.upsert({"userId": "b", "name": "B", "score": 10, "topicsCompleted": 0, "avatar": ""})
+    board.upsert({"userId": "a", "name": "A", "score": 10, "topicsCompleted": 0, "avatar": ""})
+    board.upsert({"userId": "c", "name": "C", "score": 20, "topicsCompleted": 0, "avatar": ""})
+
+    assert [board.rank_of(user_id) for user_id in ("c", "a", "b")] == [1, 2, 3]
+    board.add_score({"userId": "b", "name": "B", "topicsCompleted": 0, "avatar": ""}, 15)
+    assert board.rank_of("b") == 1
+    assert board.remove("c")
+    assert board.rank_of("c") is None
+    assert len(board) == 2
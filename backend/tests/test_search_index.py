@@ -0,0 +1,75 @@
+"""
+BM25F inverted index checked against a brute-force scorer
+"""
+
+import math
+import random
+from app.services.search_index import InvertedIndex, FIELD_BOOSTS, K1, B, tokenize
+
+WORDS = ["python", "loops", "java", "class", "objects", "recursion", "sql", "joins", "arrays", "lists"]
+
+
+def reference_scores(docs, terms):
+    """BM25F computed directly from the raw documents"""
+    doc_count = len(docs)
+    tokens = {doc_id: {field: tokenize(text) for field, text in fields.items()} for doc_id, fields in docs.items()}
+    totals = {}
+    for fields in tokens.values():
+        for field, field_tokens in fields.items():
+            totals[field] = totals.get(field, 0) + len(field_tokens)
+    average = {field: total / doc_count for field, total in totals.items()}
+
+    scores = {}
+    for term in set(terms):
+        matching = [doc_id for doc_id, fields in tokens.items() if any(term in t for t in fields.values())]
+        if not matching:
+            continue
+        idf = math.log(1 + (doc_count - len(matching) + 0.5) / (len(matching) + 0.5))
+        for doc_id in matching:
+            weighted_tf = 0.0
+            for field, field_tokens in tokens[doc_id].items():
+                tf = field_tokens.count(term)
+                if tf:
+                    norm = 1 - B + B * (len(field_tokens) / average[field] if average[field] else 0)
+                    weighted_tf += FIELD_BOOSTS[field] * tf / norm
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * weighted_tf * (K1 + 1) / (weighted_tf + K1)
+    return scores
+
+
+def random_doc(rng):
+    return {field: " ".join(rng.choices(WORDS, k=rng.randint(0, 8))) for field in FIELD_BOOSTS}
+
+
+def test_bm25f_matches_reference_under_updates():
+    rng = random.Random(12)
+    index = InvertedIndex(FIELD_BOOSTS)
+    docs = {}
+
+    for _ in range(300):
+        doc_id = f"topic-{rng.randint(0, 20)}"
+        if doc_id in docs and rng.random() < 0.3:
+            index.remove(doc_id)
+            del docs[doc_id]
+        else:
+            docs[doc_id] = random_doc(rng)
+            index.add(doc_id, docs[doc_id])
+
+        if not docs:
+            continue
+        terms = rng.sample(WORDS, rng.randint(1, 3))
+        expected = reference_scores(docs, terms)
+        actual = {doc_id: score for doc_id, (score, _) in index.search(terms).items()}
+        assert actual.keys() == expected.keys()
+        for doc_id, score in expected.items():
+            assert math.isclose(actual[doc_id], score, rel_tol=1e-9)
+
+
+def test_name_match_outranks_quiz_match():
+    index = InvertedIndex(FIELD_BOOSTS)
+    index.add("named", {"name": "Python Loops", "quiz": "what is a list"})
+    index.add("quizzed", {"name": "Java OOP", "quiz": "compare loops in java"})
+
+    results = index.search(tokenize("loops"))
+    assert results["named"][0] > results["quizzed"][0]
+    assert results["named"][1] == ["name"]
+    assert results["quizzed"][1] == ["quiz"]
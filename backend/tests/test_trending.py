@@ -0,0 +1,67 @@
+"""
+Decayed Space-Saving sketch: error bounds, decay and idle rescaling
+"""
+
+import random
+from collections import Counter
+from app.services.trending import DecayedSpaceSaving, TrendingSearches, query_key, MAX_QUERY_WORDS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_space_saving_bounds_hold_without_decay():
+    rng = random.Random(15)
+    clock = FakeClock()
+    sketch = DecayedSpaceSaving(capacity=20, half_life=1e12, clock=clock)
+    true_counts = Counter()
+    # Skewed stream: a few heavy queries among many rare ones
+    for _ in range(5000):
+        key = f"heavy-{rng.randint(0, 4)}" if rng.random() < 0.5 else f"rare-{rng.randint(0, 500)}"
+        sketch.add(key)
+        true_counts[key] += 1
+
+    assert len(sketch) == 20
+    for key in sketch.top(20):
+        assert sketch.guaranteed(key) - 1e-6 <= true_counts[key] <= sketch.count(key) + 1e-6
+    # Anything above total / capacity is guaranteed to be tracked
+    for key, count in true_counts.items():
+        if count > 5000 / 20:
+            assert key in sketch.top(20)
+
+
+def test_counts_halve_every_half_life():
+    clock = FakeClock()
+    sketch = DecayedSpaceSaving(capacity=4, half_life=100, clock=clock)
+    for _ in range(8):
+        sketch.add("python")
+    clock.now += 100
+    assert abs(sketch.count("python") - 4) < 1e-9
+    clock.now += 200
+    assert abs(sketch.total() - 1) < 1e-9
+
+
+def test_reads_after_long_idle_do_not_overflow():
+    clock = FakeClock()
+    sketch = DecayedSpaceSaving(capacity=4, half_life=1, clock=clock)
+    sketch.add("python")
+    clock.now += 5000
+    assert sketch.count("python") == 0
+    assert sketch.total() == 0
+    sketch.add("java")
+    assert abs(sketch.count("java") - 1) < 1e-9
+
+
+def test_recorded_queries_are_length_capped():
+    trending = TrendingSearches(capacity=8, short_half_life=3600, long_half_life=86400)
+    huge = " ".join(f"word{i}" for i in range(1500))
+    trending.record(huge)
+    key, display, _ = trending.popular(1)[0]
+    assert key == query_key(huge)
+    assert len(key.split(" ")) == MAX_QUERY_WORDS
+    assert len(display.split(" ")) == MAX_QUERY_WORDS